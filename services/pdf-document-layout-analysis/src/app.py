@@ -4,13 +4,20 @@
 # 1. Routes have been refactored for convenience.
 # 2. A new 'density' parameter has been added to the '/analyze/high-quality' route.
 # 3. The '/analyze/fast' route now uses run_in_threadpool for better performance.
-# 4. A processing lock has been implemented for the '/analyze/high-quality' route to prevent concurrent processing.
+# 4. The '/analyze/high-quality' route runs without a global lock, limited to HIGH_QUALITY_CONCURRENCY concurrent analyses.
+# 5. A new 'stream' parameter on both '/analyze' routes returns the segments as NDJSON, page by page.
+# 6. Results of both '/analyze' routes are cached by PDF content, parameters, backends and model weights.
+# 7. Identical concurrent '/analyze' requests share a single analysis.
+# 8. The LightGBM models of the fast analysis are loaded and warmed at startup; '/readiness' waits for them.
+# 9. '/analyze/fast' can run in a pool of FAST_ANALYSIS_WORKERS processes, started and warmed before '/readiness'
+#    is ready and restarted when a worker dies; streamed pages are sent as soon as a worker predicts them.
 
 # New routes:
-# - /readiness: GET request to check if the service is ready
+# - /readiness: GET request to check if the service is ready (503 while the models are loading or if they failed to load)
 # - /: GET request to get system information
-# - /analyze/fast: POST request for fast PDF analysis
-# - /analyze/high-quality: POST request for high-quality PDF analysis with density and extension parameters
+# - /cache/stats: GET request to get the result cache hit and miss counts
+# - /analyze/fast: POST request for fast PDF analysis with stream parameter
+# - /analyze/high-quality: POST request for high-quality PDF analysis with density, extension and stream parameters
 
 # Removed routes:
 # - /save_xml/{xml_file_name}: POST request to analyze and save XML
@@ -21,28 +28,166 @@
 # - /: POST request for general PDF analysis (replaced by specific /analyze routes)
 
 import sys
+import threading
+from contextlib import nullcontext
+from functools import partial
+from itertools import groupby
+from typing import Callable, Iterator
+
 import torch
 from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import PlainTextResponse
-from asyncio import Lock
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from asyncio import Semaphore
 from fastapi.concurrency import run_in_threadpool
 
 from catch_exceptions import catch_exceptions
-from configuration import service_logger
+from configuration import (
+    service_logger,
+    HIGH_QUALITY_CONCURRENCY,
+    FAST_ANALYSIS_WORKERS,
+    FAST_ANALYSIS_WORKER_THREADS,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_MEMORY_ENTRIES,
+    RESULT_CACHE_DISK_MAX_BYTES,
+    MODELS_CHECK_INTERVAL,
+    PDF_FEATURES_BACKEND,
+)
+from pdf_layout_analysis.FastAnalysisPool import FastAnalysisPool
 from pdf_layout_analysis.get_xml import get_xml
-from pdf_layout_analysis.run_pdf_layout_analysis import analyze_pdf
-from pdf_layout_analysis.run_pdf_layout_analysis_fast import analyze_pdf_fast
+from pdf_layout_analysis.run_pdf_layout_analysis import analyze_pdf_pages, MODEL_PATHS as HIGH_QUALITY_MODEL_PATHS
+from pdf_layout_analysis.run_pdf_layout_analysis_fast import analyze_pdf_fast_pages, MODEL_PATHS as FAST_MODEL_PATHS
+from pdf_tokens_type_trainer.PdfTrainer import lightgbm_models
+from result_cache.DiskCacheTier import DiskCacheTier
+from result_cache.MemoryCacheTier import MemoryCacheTier
+from result_cache.ModelsFingerprint import ModelsFingerprint
+from result_cache.ResultCache import ResultCache
+from result_cache.SingleFlight import SingleFlight
+from streaming.NdjsonPagesResponse import NdjsonPagesResponse
 from text_extraction.get_text_extraction import get_text_extraction
 from toc.get_toc import get_toc
 
 service_logger.info(f"Is PyTorch using GPU: {torch.cuda.is_available()}")
 
 app = FastAPI()
-processing_lock = Lock()
+high_quality_slots = Semaphore(HIGH_QUALITY_CONCURRENCY)
+result_cache = ResultCache(
+    [MemoryCacheTier(RESULT_CACHE_MEMORY_ENTRIES), DiskCacheTier(RESULT_CACHE_PATH, RESULT_CACHE_DISK_MAX_BYTES)]
+)
+analyses_in_flight = SingleFlight()
+fast_models_fingerprint = ModelsFingerprint(FAST_MODEL_PATHS, MODELS_CHECK_INTERVAL)
+high_quality_models_fingerprint = ModelsFingerprint(HIGH_QUALITY_MODEL_PATHS)
+fast_analysis_pool = FastAnalysisPool(FAST_ANALYSIS_WORKERS, FAST_ANALYSIS_WORKER_THREADS) if FAST_ANALYSIS_WORKERS else None
+
+
+def get_segment_boxes(pages: Iterator[list[dict]]) -> list[dict]:
+    return [segment_box for page_segment_boxes in pages for segment_box in page_segment_boxes]
+
+
+def get_cached_pages(segment_boxes: list[dict]) -> Iterator[list[dict]]:
+    for _, page_segment_boxes in groupby(segment_boxes, key=lambda segment_box: segment_box["page_number"]):
+        yield list(page_segment_boxes)
+
+
+def cache_pages(pages: Iterator[list[dict]], cache_key: str) -> Iterator[list[dict]]:
+    segment_boxes = list()
+    for page_segment_boxes in pages:
+        segment_boxes.extend(page_segment_boxes)
+        yield page_segment_boxes
+
+    result_cache.set(cache_key, segment_boxes)
+
+
+async def stream_pages(
+    pages: Iterator[list[dict]],
+    on_close: Callable[[list[dict] | None, Exception | None], None] = lambda segment_boxes, exception: None,
+) -> StreamingResponse:
+    response = NdjsonPagesResponse(pages, on_close)
+    try:
+        await response.fetch_first_page()
+    except BaseException as exception:
+        await response.close(exception=exception if isinstance(exception, Exception) else None)
+        raise
+
+    return response
+
+
+async def analyze(cache_key: str, get_pages: Callable[[], Iterator[list[dict]]], slots: Semaphore | None = None):
+    async def get_result():
+        cached_segment_boxes = await run_in_threadpool(result_cache.get, cache_key)
+        if cached_segment_boxes is not None:
+            return cached_segment_boxes
+
+        async with slots or nullcontext():
+            return await run_in_threadpool(get_segment_boxes, cache_pages(get_pages(), cache_key))
+
+    segment_boxes = None
+    while segment_boxes is None:
+        # A streamed analysis abandoned by its client ends its flight with None
+        segment_boxes = await analyses_in_flight.run(cache_key, get_result)
+
+    return segment_boxes
+
+
+async def stream_analysis(cache_key: str, get_pages: Callable[[], Iterator[list[dict]]], slots: Semaphore | None = None):
+    flight = None
+    while flight is None:
+        segment_boxes = await analyses_in_flight.wait(cache_key)
+        if segment_boxes is None:
+            segment_boxes = await run_in_threadpool(result_cache.get, cache_key)
+        if segment_boxes is not None:
+            return await stream_pages(get_cached_pages(segment_boxes))
+
+        flight = analyses_in_flight.start(cache_key)
+
+    def on_close(segment_boxes: list[dict] | None, exception: Exception | None):
+        if slots:
+            slots.release()
+        if exception:
+            flight.set_exception(exception)
+        else:
+            flight.set_result(segment_boxes)
+
+    if slots:
+        try:
+            await slots.acquire()
+        except BaseException:
+            flight.set_result(None)
+            raise
+
+    try:
+        pages = cache_pages(get_pages(), cache_key)
+    except BaseException as exception:
+        on_close(None, exception if isinstance(exception, Exception) else None)
+        raise
+
+    return await stream_pages(pages, on_close=on_close)
+
+
+@app.on_event("startup")
+def warm_up_models():
+    if fast_analysis_pool:
+        warm_up = fast_analysis_pool.warm_up
+    else:
+        warm_up = partial(lightgbm_models.warm_up, FAST_MODEL_PATHS)
+
+    threading.Thread(target=warm_up, name="models_warm_up", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def shutdown_fast_analysis_pool():
+    if fast_analysis_pool:
+        fast_analysis_pool.shutdown()
 
 
 @app.get("/readiness")
 def readiness():
+    models = fast_analysis_pool or lightgbm_models
+    if models.has_failed():
+        return JSONResponse(status_code=503, content={"status": "failed to load models"})
+
+    if not models.is_ready():
+        return JSONResponse(status_code=503, content={"status": "loading models"})
+
     return {"status": "ready"}
 
 
@@ -50,10 +195,32 @@ def readiness():
 async def info():
     return sys.version + " Using GPU: " + str(torch.cuda.is_available())
 
+
+@app.get("/cache/stats")
+def cache_stats():
+    return result_cache.get_stats()
+
+
 @app.post("/analyze/fast")
 @catch_exceptions
-async def run_fast(file: UploadFile = File(...)):
-    return await run_in_threadpool(analyze_pdf_fast, file.file.read(), "")
+async def run_fast(file: UploadFile = File(...), stream: bool = Form(False)):
+    file_content = file.file.read()
+    cache_key = await run_in_threadpool(
+        ResultCache.get_key,
+        file_content,
+        "fast",
+        fast_models_fingerprint.get(),
+        pdf_features_backend=PDF_FEATURES_BACKEND,
+    )
+    if fast_analysis_pool:
+        get_pages = partial(fast_analysis_pool.analyze_pdf_fast_pages, file_content, stream)
+    else:
+        get_pages = partial(analyze_pdf_fast_pages, file_content, "", page_by_page=stream)
+
+    if stream:
+        return await stream_analysis(cache_key, get_pages)
+
+    return await analyze(cache_key, get_pages)
 
 
 @app.post("/analyze/high-quality")
@@ -61,10 +228,25 @@ async def run_fast(file: UploadFile = File(...)):
 async def run_high_quality(
     file: UploadFile = File(...),
     density: int = Form(72),
-    extension: str = Form("jpeg")
+    extension: str = Form("jpeg"),
+    stream: bool = Form(False),
 ):
-    async with processing_lock:
-        return analyze_pdf(file.file.read(), "", density, extension)
+    file_content = file.file.read()
+    cache_key = await run_in_threadpool(
+        ResultCache.get_key,
+        file_content,
+        "high_quality",
+        high_quality_models_fingerprint.get(),
+        density=density,
+        extension=extension,
+        pdf_features_backend=PDF_FEATURES_BACKEND,
+    )
+    get_pages = partial(analyze_pdf_pages, file_content, "", density, extension)
+
+    if stream:
+        return await stream_analysis(cache_key, get_pages, high_quality_slots)
+
+    return await analyze(cache_key, get_pages, high_quality_slots)
 
 
 # @app.post("/save_xml/{xml_file_name}")
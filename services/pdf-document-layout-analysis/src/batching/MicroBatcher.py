@@ -0,0 +1,68 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+class MicroBatcher:
+    """Groups items submitted from many threads into batches processed by a single worker thread.
+
+    A batch is closed when it reaches max_batch_size (measured with get_item_size) or when max_wait_time
+    seconds have passed since its first item arrived. process_batch receives the items of one batch and
+    must return one result per item, in the same order; each result is routed back to its item's future.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[list], list],
+        max_batch_size: int,
+        max_wait_time: float,
+        get_item_size: Callable[[Any], int] = lambda item: 1,
+        name: str = "micro_batcher",
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_time = max(0.0, max_wait_time)
+        self.get_item_size = get_item_size
+        self.pending: queue.Queue[tuple[Any, Future]] = queue.Queue()
+        self.worker = threading.Thread(target=self.run, name=name, daemon=True)
+        self.worker.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self.pending.put((item, future))
+        return future
+
+    def get_batch(self) -> list[tuple[Any, Future]]:
+        batch = [self.pending.get()]
+        batch_size = self.get_item_size(batch[0][0])
+        deadline = time.monotonic() + self.max_wait_time
+        while batch_size < self.max_batch_size:
+            remaining_time = deadline - time.monotonic()
+            try:
+                item, future = self.pending.get(timeout=remaining_time) if remaining_time > 0 else self.pending.get_nowait()
+            except queue.Empty:
+                break
+            batch.append((item, future))
+            batch_size += self.get_item_size(item)
+
+        return batch
+
+    def run(self):
+        while True:
+            batch = [(item, future) for item, future in self.get_batch() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                results = self.process_batch([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"process_batch returned {len(results)} results for {len(batch)} items")
+            except Exception as exception:
+                for _, future in batch:
+                    future.set_exception(exception)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
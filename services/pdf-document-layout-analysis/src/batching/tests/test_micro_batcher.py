@@ -0,0 +1,55 @@
+import threading
+from unittest import TestCase
+
+from batching.MicroBatcher import MicroBatcher
+
+
+class TestMicroBatcher(TestCase):
+    def test_results_are_routed_to_each_future(self):
+        batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_batch_size=4, max_wait_time=0.01)
+
+        futures = [batcher.submit(i) for i in range(10)]
+
+        self.assertEqual([i * 2 for i in range(10)], [future.result(timeout=5) for future in futures])
+
+    def test_batches_are_limited_by_size(self):
+        batch_sizes = list()
+        release = threading.Event()
+
+        def process_batch(items):
+            release.wait(timeout=5)
+            batch_sizes.append(sum(len(item) for item in items))
+            return items
+
+        batcher = MicroBatcher(process_batch, max_batch_size=5, max_wait_time=0.05, get_item_size=len)
+        futures = [batcher.submit([0] * 2) for _ in range(7)]
+        release.set()
+
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(14, sum(batch_sizes))
+        self.assertTrue(all(batch_size <= 6 for batch_size in batch_sizes))
+
+    def test_exceptions_are_set_on_every_future_of_the_batch(self):
+        def process_batch(items):
+            raise ValueError("wrong batch")
+
+        batcher = MicroBatcher(process_batch, max_batch_size=2, max_wait_time=0.01)
+        futures = [batcher.submit(i) for i in range(2)]
+
+        for future in futures:
+            self.assertRaises(ValueError, future.result, 5)
+
+    def test_wrong_results_count_is_set_on_every_future_of_the_batch(self):
+        release = threading.Event()
+
+        def process_batch(items):
+            release.wait(timeout=5)
+            return items[:-1]
+
+        batcher = MicroBatcher(process_batch, max_batch_size=3, max_wait_time=0.05)
+        futures = [batcher.submit(i) for i in range(3)]
+        release.set()
+
+        for future in futures:
+            self.assertRaises(ValueError, future.result, 5)
@@ -0,0 +1,55 @@
+import sys
+import time
+
+import numpy as np
+import torch
+
+from ditod.Wordnn_embedding import paint_boxes
+
+BATCH_SIZE = 2
+PAGE_HEIGHT = 1024
+PAGE_WIDTH = 800
+SUBWORDS_COUNTS = [2000, 5000, 10000]
+
+
+def get_page_boxes(subwords_count: int, rng: np.random.Generator) -> np.ndarray:
+    lefts = rng.uniform(0, PAGE_WIDTH - 40, subwords_count)
+    tops = rng.uniform(0, PAGE_HEIGHT - 12, subwords_count)
+    widths, heights = rng.uniform(3, 40, subwords_count), rng.uniform(6, 12, subwords_count)
+    return np.column_stack([lefts, tops, lefts + widths, tops + heights])
+
+
+def paint_boxes_one_by_one(chargrid_map: torch.Tensor, batch_indexes: np.ndarray, boxes: np.ndarray, ids: np.ndarray):
+    for batch_index, box, box_id in zip(batch_indexes, boxes, ids):
+        w_start, h_start, w_end, h_end = box.tolist()
+        chargrid_map[batch_index, h_start:h_end, w_start:w_end] = int(box_id)
+
+
+def benchmark(subwords_count: int, device: str):
+    rng = np.random.default_rng(subwords_count)
+    boxes = np.concatenate([get_page_boxes(subwords_count, rng) for _ in range(BATCH_SIZE)]).round().astype(int)
+    batch_indexes = np.repeat(np.arange(BATCH_SIZE), subwords_count)
+    ids = rng.integers(1000, 30000, len(boxes))
+
+    results = list()
+    for paint in [paint_boxes_one_by_one, paint_boxes]:
+        chargrid_map = torch.zeros((BATCH_SIZE, PAGE_HEIGHT, PAGE_WIDTH), dtype=torch.int64).to(device)
+        paint_ids = ids if paint is paint_boxes_one_by_one else torch.as_tensor(ids, device=device)
+        start = time.perf_counter()
+        paint(chargrid_map, batch_indexes, boxes, paint_ids)
+        if device.startswith("cuda"):
+            torch.cuda.synchronize()
+        results.append((time.perf_counter() - start, chargrid_map.cpu()))
+
+    (loop_seconds, loop_chargrid_map), (batched_seconds, batched_chargrid_map) = results
+    assert torch.equal(loop_chargrid_map, batched_chargrid_map)
+    print(
+        f"{subwords_count} subwords per page, {BATCH_SIZE} pages on {device}: "
+        f"one by one {loop_seconds * 1000:.0f}ms, batched {batched_seconds * 1000:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    benchmark_device = sys.argv[1] if len(sys.argv) > 1 else "cuda" if torch.cuda.is_available() else "cpu"
+    for subwords in SUBWORDS_COUNTS:
+        benchmark(subwords, benchmark_device)
@@ -0,0 +1,49 @@
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os.path import join
+
+import lightgbm as lgb
+import numpy as np
+
+from pdf_tokens_type_trainer.LightGBMModels import LightGBMModels
+
+FEATURES_COUNT = 8 * 246
+CLASSES_COUNT = 13
+REQUESTS_COUNT = 400
+ROWS_PER_REQUEST = 60
+
+
+def save_model(model_path: str):
+    x = np.random.default_rng(0).random((2000, FEATURES_COUNT))
+    labels = np.arange(len(x)) % CLASSES_COUNT
+    params = {"objective": "multiclass", "num_class": CLASSES_COUNT, "num_iterations": 50, "verbose": -1}
+    lgb.train(params, lgb.Dataset(x, labels)).save_model(model_path)
+
+
+def benchmark(lightgbm_models: LightGBMModels, model_path: str, concurrency: int) -> float:
+    requests_x = [np.random.default_rng(i).random((ROWS_PER_REQUEST, FEATURES_COUNT)) for i in range(REQUESTS_COUNT)]
+    lightgbm_models.warm_up([model_path])
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(partial(lightgbm_models.predict, model_path), requests_x))
+
+    return time.perf_counter() - start
+
+
+def run_benchmark(concurrency: int):
+    with tempfile.TemporaryDirectory() as model_folder:
+        model_path = join(model_folder, "model.txt")
+        save_model(model_path)
+        print(f"{REQUESTS_COUNT} requests of {ROWS_PER_REQUEST} rows, {concurrency} concurrent")
+        for max_batch_rows in [0, 2000, 10000]:
+            seconds = benchmark(
+                LightGBMModels(max_batch_rows=max_batch_rows, batch_wait_time=0.005), model_path, concurrency
+            )
+            print(f"max_batch_rows={max_batch_rows}: {seconds:.2f}s, {REQUESTS_COUNT / seconds:.0f} requests/s")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 16)
@@ -0,0 +1,36 @@
+import shutil
+import sys
+import time
+from os.path import join
+from pathlib import Path
+
+from configuration import ROOT_PATH
+from pdf_features.PdfFeatures import PdfFeatures
+
+REPETITIONS = 5
+
+
+def benchmark_backend(pdfs_paths: list[Path], backend: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        for pdf_path in pdfs_paths:
+            PdfFeatures.from_pdf_path(str(pdf_path), backend=backend)
+
+    return (time.perf_counter() - start) / REPETITIONS
+
+
+def run_benchmark(pdfs_folder: str | Path):
+    pdfs_paths = sorted(path for path in Path(pdfs_folder).glob("*.pdf") if PdfFeatures.from_pymupdf(path))
+    print(f"{len(pdfs_paths)} PDFs from {pdfs_folder}, {REPETITIONS} repetitions")
+
+    backends = ["pymupdf", "poppler"] if shutil.which("pdftohtml") else ["pymupdf"]
+    times = {backend: benchmark_backend(pdfs_paths, backend) for backend in backends}
+    for backend, seconds in times.items():
+        print(f"{backend}: {seconds:.3f}s per pass, {1000 * seconds / max(1, len(pdfs_paths)):.1f}ms per PDF")
+
+    if "poppler" in times:
+        print(f"Speedup: {times['poppler'] / times['pymupdf']:.1f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else join(ROOT_PATH, "test_pdfs"))
@@ -0,0 +1,62 @@
+import gc
+import resource
+from multiprocessing import get_context
+import sys
+import tempfile
+import time
+import tracemalloc
+from os.path import join
+
+import pymupdf
+
+from pdf_features.PdfFeatures import PdfFeatures
+
+PAGES_COUNT = 1000
+LINES_PER_PAGE = 40
+WORDS_PER_LINE = 10
+
+
+def create_large_pdf(pdf_path: str):
+    document = pymupdf.open()
+    page = document.new_page()
+    for line_index in range(LINES_PER_PAGE):
+        for word_index in range(WORDS_PER_LINE):
+            page.insert_text((40 + 52 * word_index, 40 + 18 * line_index), f"word{line_index}_{word_index}", fontsize=7)
+
+    for _ in range(PAGES_COUNT - 1):
+        document.fullcopy_page(0)
+
+    document.save(pdf_path)
+
+
+def measure_pdf_features(pdf_path: str, backend: str):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    pdf_features = PdfFeatures.from_pdf_path(pdf_path, backend=backend)
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tokens_count = sum(len(page.tokens) for page in pdf_features.pages)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{len(pdf_features.pages)} pages, {tokens_count} tokens, {backend} backend, {seconds:.2f}s")
+    print(f"Retained: {current / 1024 ** 2:.1f}MB, {current / max(1, tokens_count):.0f} bytes per token")
+    print(f"Peak traced: {peak / 1024 ** 2:.1f}MB, peak RSS: {max_rss:.1f}MB")
+
+
+def run_benchmark(pdf_path: str, backend: str):
+    process = get_context("spawn").Process(target=measure_pdf_features, args=(pdf_path, backend))
+    process.start()
+    process.join()
+
+
+if __name__ == "__main__":
+    backend = sys.argv[2] if len(sys.argv) > 2 else "pymupdf"
+    if len(sys.argv) > 1 and sys.argv[1] != "-":
+        run_benchmark(sys.argv[1], backend)
+    else:
+        with tempfile.TemporaryDirectory() as pdf_folder:
+            pdf_path = join(pdf_folder, "large.pdf")
+            create_large_pdf(pdf_path)
+            run_benchmark(pdf_path, backend)
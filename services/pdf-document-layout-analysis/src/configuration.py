@@ -1,4 +1,5 @@
 import logging
+import os
 from os.path import join
 from pathlib import Path
 
@@ -18,6 +19,24 @@ JSON_TEST_FILE_PATH = Path(join(JSONS_ROOT_PATH, "test.json"))
 MODELS_PATH = Path(join(ROOT_PATH, "models"))
 XMLS_PATH = Path(join(ROOT_PATH, "xmls"))
 
+PDF_FEATURES_BACKEND = os.getenv("PDF_FEATURES_BACKEND", "poppler")
+
+HIGH_QUALITY_CONCURRENCY = int(os.getenv("HIGH_QUALITY_CONCURRENCY", 2))
+VGT_MAX_BATCH_SIZE = int(os.getenv("VGT_MAX_BATCH_SIZE", 4))
+VGT_BATCH_WAIT_TIME = float(os.getenv("VGT_BATCH_WAIT_TIME", 0.05))
+WORD_GRID_SUBWORDS_CACHE_SIZE = int(os.getenv("WORD_GRID_SUBWORDS_CACHE_SIZE", 100000))
+RASTERIZATION_WORKERS = int(os.getenv("RASTERIZATION_WORKERS", 4))
+FAST_ANALYSIS_WORKERS = int(os.getenv("FAST_ANALYSIS_WORKERS", 0))
+FAST_ANALYSIS_WORKER_THREADS = int(os.getenv("FAST_ANALYSIS_WORKER_THREADS", 1))
+LIGHTGBM_NUM_THREADS = int(os.getenv("LIGHTGBM_NUM_THREADS", 0))
+LIGHTGBM_MAX_BATCH_ROWS = int(os.getenv("LIGHTGBM_MAX_BATCH_ROWS", 0))
+LIGHTGBM_BATCH_WAIT_TIME = float(os.getenv("LIGHTGBM_BATCH_WAIT_TIME", 0.005))
+
+RESULT_CACHE_PATH = Path(os.getenv("RESULT_CACHE_PATH", join(ROOT_PATH, "cached_results")))
+RESULT_CACHE_MEMORY_ENTRIES = int(os.getenv("RESULT_CACHE_MEMORY_ENTRIES", 64))
+RESULT_CACHE_DISK_MAX_BYTES = int(os.getenv("RESULT_CACHE_DISK_MAX_BYTES", 1024**3))
+MODELS_CHECK_INTERVAL = float(os.getenv("MODELS_CHECK_INTERVAL", 10))
+
 DOCLAYNET_TYPE_BY_ID = {
     1: "Caption",
     2: "Footnote",
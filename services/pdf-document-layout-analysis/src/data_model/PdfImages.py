@@ -3,6 +3,8 @@
 # 1. It includes additional parameters 'density' and 'extension' in the from_pdf_path method.
 # 2. The convert_from_path function now uses the 'density' parameter and explicitly sets the output format to 'jpeg'.
 # 3. The pdf_name assignment logic has been updated to use the new parameters.
+# 4. Images are no longer saved on creation; save_images and remove_images take the folder to use.
+# 5. Pages are rasterized in parallel page ranges to lossless RGB numpy arrays; 'extension' only affects save_images.
 # These changes allow for more flexibility in image conversion settings and file naming.
 
 
@@ -14,40 +16,44 @@ import numpy as np
 from os import makedirs
 from os.path import join
 from pathlib import Path
-from PIL import Image
-from pdf2image import convert_from_path
 from pdf_features.PdfFeatures import PdfFeatures
+from vgt.rasterize_pdf import rasterize_pdf
 
 from src.configuration import IMAGES_ROOT_PATH, XMLS_PATH
 
 
 class PdfImages:
-    def __init__(self, pdf_features: PdfFeatures, pdf_images: list[Image]):
+    def __init__(self, pdf_features: PdfFeatures, pdf_images: list[np.ndarray], extension: str = "jpg"):
         self.pdf_features: PdfFeatures = pdf_features
-        self.pdf_images: list[Image] = pdf_images
-        self.save_images()
+        self.pdf_images: list[np.ndarray] = pdf_images
+        self.extension = "jpg" if extension == "jpeg" else extension
 
     def show_images(self, next_image_delay: int = 2):
         for image_index, image in enumerate(self.pdf_images):
-            image_np = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+            image_np = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
             cv2.imshow(f"Page: {image_index + 1}", image_np)
             cv2.waitKey(next_image_delay * 1000)
             cv2.destroyAllWindows()
 
-    def save_images(self):
-        makedirs(IMAGES_ROOT_PATH, exist_ok=True)
+    def save_images(self, images_path: str | Path = IMAGES_ROOT_PATH):
+        makedirs(images_path, exist_ok=True)
         for image_index, image in enumerate(self.pdf_images):
-            image_name = f"{self.pdf_features.file_name}_{image_index}.jpg"
-            image.save(join(IMAGES_ROOT_PATH, image_name))
+            image_name = f"{self.pdf_features.file_name}_{image_index}.{self.extension}"
+            cv2.imwrite(join(images_path, image_name), cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
 
     @staticmethod
-    def remove_images():
-        shutil.rmtree(IMAGES_ROOT_PATH)
+    def remove_images(images_path: str | Path = IMAGES_ROOT_PATH):
+        shutil.rmtree(images_path, ignore_errors=True)
 
     @staticmethod
-    def from_pdf_path(pdf_path: str | Path, pdf_name: str = "", xml_file_name: str = "", density: int = 72, extension: str = "jpeg"):
+    def from_pdf_path(
+        pdf_path: str | Path,
+        pdf_name: str = "",
+        xml_file_name: str = "",
+        density: int = 72,
+        extension: str = "jpeg",
+    ):
         xml_path = Path(join(XMLS_PATH, xml_file_name)) if xml_file_name else None
-
         if xml_path and not xml_path.parent.exists():
             os.makedirs(xml_path.parent, exist_ok=True)
 
@@ -58,5 +64,5 @@ class PdfImages:
         else:
             pdf_name = Path(pdf_path).parent.name if Path(pdf_path).name == "document.pdf" else Path(pdf_path).stem
             pdf_features.file_name = pdf_name
-        pdf_images = convert_from_path(pdf_path, dpi=density, fmt=extension)
-        return PdfImages(pdf_features, pdf_images)
+        pdf_images = rasterize_pdf(pdf_path, density)
+        return PdfImages(pdf_features, pdf_images, extension)
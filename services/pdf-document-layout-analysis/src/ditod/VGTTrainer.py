@@ -54,7 +54,7 @@ from .VGTcheckpointer import MyDetectionCheckpointer
 from typing import Any, Dict, List, Set
 import itertools
 from detectron2.solver.build import maybe_add_gradient_clipping
-from .dataset_mapper import DetrDatasetMapper
+from .dataset_mapper import DetrDatasetMapper, transform_subwords_boxes
 from detectron2.evaluation import COCOEvaluator
 
 import pickle
@@ -351,13 +351,7 @@ class DefaultPredictor:
             bbox_subword_list = sample_inputs["bbox_subword_list"]
 
             # word bbox
-            bbox = []
-            for bbox_per_subword in bbox_subword_list:
-                text_word = {}
-                text_word["bbox"] = bbox_per_subword.tolist()
-                text_word["bbox_mode"] = BoxMode.XYWH_ABS
-                utils.transform_instance_annotations(text_word, transforms, image_shape)
-                bbox.append(text_word["bbox"])
+            bbox = transform_subwords_boxes(bbox_subword_list, transforms, image_shape)
 
             dataset_dict = {}
             dataset_dict["input_ids"] = input_ids
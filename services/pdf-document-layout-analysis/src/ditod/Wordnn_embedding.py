@@ -3,6 +3,8 @@ import torch
 from torch import nn
 from .tokenization_bros import BrosTokenizer
 
+MAX_PAINTED_PIXELS = 1 << 20
+
 
 def _init_weights(m):
     if isinstance(m, nn.Linear):
@@ -15,6 +17,51 @@ def _init_weights(m):
         nn.init.constant_(m.weight, 1.0)
 
 
+def get_slices_bounds(starts: np.ndarray, ends: np.ndarray, size: int):
+    """Start and length of the slices starts:ends of a dimension of the given size, as Python slicing resolves them."""
+    starts = np.where(starts < 0, np.clip(starts + size, 0, None), np.minimum(starts, size))
+    ends = np.where(ends < 0, np.clip(ends + size, 0, None), np.minimum(ends, size))
+    return starts, np.clip(ends - starts, 0, None)
+
+
+def paint_boxes(chargrid_map: torch.Tensor, batch_indexes: np.ndarray, boxes: np.ndarray, ids: torch.Tensor):
+    """Writes ids[i] into chargrid_map[batch_indexes[i], h_start:h_end, w_start:w_end] for every box of boxes.
+
+    Boxes are [w_start, h_start, w_end, h_end] and later boxes overwrite earlier ones, as when assigning them one
+    by one. The boxes are expanded into their pixels and every pixel takes the id of the highest box index that
+    covers it (scatter_reduce "amax"), in chunks of at most MAX_PAINTED_PIXELS pixels, as every chunk allocates
+    several int64 tensors of its pixels count. The map of the last boxes is allocated once, and each chunk only
+    reads and resets its own pixels.
+    """
+    _, height, width = chargrid_map.shape
+    device = chargrid_map.device
+    w_starts, widths = get_slices_bounds(boxes[:, 0], boxes[:, 2], width)
+    h_starts, heights = get_slices_bounds(boxes[:, 1], boxes[:, 3], height)
+    areas = widths * heights
+    cumulative_areas = np.cumsum(areas)
+    boxes_offsets = torch.as_tensor(batch_indexes * height * width + h_starts * width + w_starts, device=device)
+    widths = torch.as_tensor(widths, device=device)
+    flat_chargrid_map = chargrid_map.view(-1)
+    last_boxes = torch.full_like(flat_chargrid_map, -1)
+
+    start = 0
+    while start < len(boxes):
+        chunk_limit = cumulative_areas[start] - areas[start] + MAX_PAINTED_PIXELS
+        end = max(start + 1, int(np.searchsorted(cumulative_areas, chunk_limit, side="right")))
+        chunk_areas = torch.as_tensor(areas[start:end], device=device)
+        chunk_boxes_indexes = torch.repeat_interleave(torch.arange(end - start, device=device), chunk_areas)
+        chunk_starts = torch.repeat_interleave(torch.cumsum(chunk_areas, 0) - chunk_areas, chunk_areas)
+        pixels_in_boxes = torch.arange(len(chunk_boxes_indexes), device=device) - chunk_starts
+        boxes_widths = widths[start:end][chunk_boxes_indexes]
+        pixels_rows, pixels_columns = pixels_in_boxes // boxes_widths, pixels_in_boxes % boxes_widths
+        pixels = boxes_offsets[start:end][chunk_boxes_indexes] + pixels_rows * width + pixels_columns
+
+        last_boxes.scatter_reduce_(0, pixels, chunk_boxes_indexes, reduce="amax")
+        flat_chargrid_map[pixels] = ids[start:end][last_boxes[pixels]]
+        last_boxes[pixels] = -1
+        start = end
+
+
 class WordnnEmbedding(nn.Module):
     """Generate chargrid embedding feature map."""
 
@@ -70,6 +117,7 @@ class WordnnEmbedding(nn.Module):
 
         chargrid_map = torch.zeros((batch_b, batch_h // stride, batch_w // stride), dtype=torch.int64).to(device)
 
+        batch_indexes, boxes, ids = [], [], []
         for iter_b in range(batch_b):
             per_input_ids = batched_inputs[iter_b]["input_ids"]
             per_input_bbox = batched_inputs[iter_b]["bbox"]
@@ -77,16 +125,17 @@ class WordnnEmbedding(nn.Module):
             short_length_w = min(len(per_input_ids), len(per_input_bbox))
 
             if short_length_w > 0:
-                for word_idx in range(short_length_w):
-                    per_id = per_input_ids[word_idx]
-
-                    bbox = per_input_bbox[word_idx] / stride
-                    w_start, h_start, w_end, h_end = bbox.round().astype(int).tolist()
-
-                    if self.use_UNK_text:
-                        chargrid_map[iter_b, h_start:h_end, w_start:w_end] = 100
-                    else:
-                        chargrid_map[iter_b, h_start:h_end, w_start:w_end] = per_id
+                batch_indexes.append(np.full(short_length_w, iter_b))
+                boxes.append(np.asarray(per_input_bbox[:short_length_w]) / stride)
+                if self.use_UNK_text:
+                    ids.append(np.full(short_length_w, 100))
+                else:
+                    ids.append(np.asarray(per_input_ids[:short_length_w]))
+
+        if boxes:
+            boxes = np.concatenate(boxes).round().astype(int)
+            ids = torch.as_tensor(np.concatenate(ids), dtype=torch.int64, device=device)
+            paint_boxes(chargrid_map, np.concatenate(batch_indexes), boxes, ids)
 
         chargrid_map = self.embedding(chargrid_map)
         chargrid_map = self.embedding_proj(chargrid_map)
@@ -4,6 +4,7 @@
 
 import copy
 import logging
+from collections import OrderedDict
 from os import path
 
 import numpy as np
@@ -26,8 +27,12 @@ from detectron2.structures import (
     polygons_to_bitmask,
 )
 
+from vgt.WordGridsFile import WordGridsFile
+
 __all__ = ["DetrDatasetMapper"]
 
+WORD_GRIDS_FILES_CACHE_SIZE = 8
+
 
 def build_transform_gen(cfg, is_train):
     """
@@ -83,6 +88,26 @@ def build_transform_gen_w(cfg, is_train):
     return tfm_gens
 
 
+def transform_subwords_boxes(bbox_subword_list, transforms, image_shape):
+    """
+    Transforms the XYWH_ABS subword boxes of a word grid to XYXY_ABS boxes of the transformed image, with
+    one transforms.apply_box call. Gives the same boxes as utils.transform_instance_annotations applied to
+    each box, which converts the box mode in float32 before transforming and clipping the box.
+
+    Returns:
+        ndarray: the boxes, of shape (N, 4).
+    """
+    boxes = np.asarray(bbox_subword_list, dtype=np.float32).reshape(-1, 4)
+    if not len(boxes):
+        return np.zeros((0, 4))
+
+    boxes = BoxMode.convert(boxes, BoxMode.XYWH_ABS, BoxMode.XYXY_ABS).astype(np.float64)
+    if isinstance(transforms, (tuple, list)):
+        transforms = T.TransformList(transforms)
+    boxes = transforms.apply_box(boxes).clip(min=0)
+    return np.minimum(boxes, list(image_shape + image_shape)[::-1])
+
+
 class DetrDatasetMapper:
     """
     A callable which takes a dataset dict in Detectron2 Dataset format,
@@ -90,7 +115,7 @@ class DetrDatasetMapper:
 
     The callable currently does the following:
 
-    1. Read the image from "file_name"
+    1. Read the image from "file_name", and its word grid from "word_grid" or from the word_grids folder
     2. Applies geometric transforms to the image and annotation
     3. Find and applies suitable cropping to the image and annotation
     4. Prepare image and annotation to Tensors
@@ -117,6 +142,33 @@ class DetrDatasetMapper:
         self.cfg = cfg
 
         logger = logging.getLogger("detectron2")
+        self.word_grids_files: OrderedDict[str, WordGridsFile] = OrderedDict()
+
+    def get_word_grid(self, image_path: str):
+        """
+        Word grid of an image, from the "<pdf name>.word_grids" file of its document (see WordGridsFile)
+        or from the "<pdf name>_<page index>.pkl" file of the page in the word_grids folder.
+        Only the WORD_GRIDS_FILES_CACHE_SIZE most recently used word grids files are kept mapped.
+        """
+        word_grids_folder, image_name = path.split(image_path.replace("images", "word_grids"))
+        pdf_name, _, page_index = path.splitext(image_name)[0].rpartition("_")
+        word_grids_file_path = path.join(word_grids_folder, f"{pdf_name}.word_grids")
+        if page_index.isdigit() and path.exists(word_grids_file_path):
+            if word_grids_file_path in self.word_grids_files:
+                self.word_grids_files.move_to_end(word_grids_file_path)
+            else:
+                self.word_grids_files[word_grids_file_path] = WordGridsFile(word_grids_file_path)
+                while len(self.word_grids_files) > WORD_GRIDS_FILES_CACHE_SIZE:
+                    self.word_grids_files.popitem(last=False)
+            return self.word_grids_files[word_grids_file_path].get_page(int(page_index))
+
+        word_grid_path = image_path.replace("images", "word_grids").replace(".jpg", ".pkl")
+        if path.exists(word_grid_path):
+            with open(word_grid_path, "rb") as f:
+                return pickle.load(f)
+
+        logging.getLogger(__name__).warning(f"No word grid in: {word_grids_file_path} or {word_grid_path}")
+        return {"input_ids": [], "bbox_subword_list": []}
 
     def __call__(self, dataset_dict):
         """
@@ -126,20 +178,17 @@ class DetrDatasetMapper:
         Returns:
             dict: a format that builtin models in detectron2 accept
         """
-        dataset_dict = copy.deepcopy(dataset_dict)  # it will be modified by code below
+        sample_inputs = dataset_dict.get("word_grid")
+        dataset_dict = {key: value for key, value in dataset_dict.items() if key != "word_grid"}
+        if self.is_train:
+            dataset_dict = copy.deepcopy(dataset_dict)  # it will be modified by code below
         image = utils.read_image(dataset_dict["file_name"], format=self.img_format)
         utils.check_image_size(dataset_dict, image)
 
-        word_grid_path = dataset_dict["file_name"].replace("images", "word_grids").replace(".jpg", ".pkl")
-        if path.exists(word_grid_path):
-            with open(word_grid_path, "rb") as f:
-                sample_inputs = pickle.load(f)
-            input_ids = sample_inputs["input_ids"]
-            bbox_subword_list = sample_inputs["bbox_subword_list"]
-        else:
-            input_ids = []
-            bbox_subword_list = []
-            print(f"No word grid pkl in: {word_grid_path}")
+        if sample_inputs is None:
+            sample_inputs = self.get_word_grid(dataset_dict["file_name"])
+        input_ids = sample_inputs["input_ids"]
+        bbox_subword_list = sample_inputs["bbox_subword_list"]
 
         image_shape_ori = image.shape[:2]  # h, w
 
@@ -167,13 +216,7 @@ class DetrDatasetMapper:
         dataset_dict["image"] = torch.as_tensor(np.ascontiguousarray(image.transpose(2, 0, 1)))
 
         ## 产出 text grid
-        bbox = []
-        for bbox_per_subword in bbox_subword_list:
-            text_word = {}
-            text_word["bbox"] = bbox_per_subword.tolist()
-            text_word["bbox_mode"] = BoxMode.XYWH_ABS
-            utils.transform_instance_annotations(text_word, transforms, image_shape)
-            bbox.append(text_word["bbox"])
+        bbox = transform_subwords_boxes(bbox_subword_list, transforms, image_shape)
 
         dataset_dict["input_ids"] = input_ids
         dataset_dict["bbox"] = bbox
@@ -1,11 +1,15 @@
 from pathlib import Path
 
+import numpy as np
+
 from fast_trainer.Paragraph import Paragraph
 from fast_trainer.PdfSegment import PdfSegment
+from pdf_features.PdfPage import PdfPage
 from pdf_features.PdfToken import PdfToken
 from pdf_token_type_labels.TokenType import TokenType
 from pdf_tokens_type_trainer.TokenFeatures import TokenFeatures
 from pdf_tokens_type_trainer.TokenTypeTrainer import TokenTypeTrainer
+from pdf_tokens_type_trainer.VectorizedTokenFeatures import VectorizedTokenFeatures
 
 
 class ParagraphExtractorTrainer(TokenTypeTrainer):
@@ -21,6 +25,14 @@ class ParagraphExtractorTrainer(TokenTypeTrainer):
 
         return token_row_features
 
+    def get_pairs_features(
+        self, token_features: VectorizedTokenFeatures, page: PdfPage, page_tokens: list[PdfToken]
+    ) -> np.ndarray:
+        token_types = np.array([list(TokenType).index(token.token_type) for token in page_tokens])
+        token_types_one_hot = np.eye(len(TokenType), dtype=np.float64)[token_types]
+        pairs_features = self.get_base_pairs_features(token_features, page, page_tokens)
+        return np.hstack([pairs_features, token_types_one_hot[:-1], token_types_one_hot[1:]])
+
     @staticmethod
     def get_paragraph_extraction_features(first_token: PdfToken, second_token: PdfToken) -> list[int]:
         one_hot_token_type_1 = [1 if token_type == first_token.token_type else 0 for token_type in TokenType]
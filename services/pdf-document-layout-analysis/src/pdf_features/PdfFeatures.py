@@ -1,21 +1,24 @@
+import copy
 import json
-import os
 import subprocess
 import tempfile
-from collections import Counter
+from functools import cached_property
+from io import BytesIO
 from os.path import join, exists
 from pathlib import Path
-from statistics import mode
+from typing import IO
 
 from lxml import etree
-from lxml.etree import ElementBase, XMLSyntaxError
+from lxml.etree import XMLSyntaxError
 
 from pdf_features.PdfFont import PdfFont
 from pdf_features.PdfModes import PdfModes
 from pdf_features.PdfPage import PdfPage
-from pdf_features.PdfToken import PdfToken
+from pdf_features.PdfTokensIndex import PdfTokensIndex
+from pdf_features.PdfTokensStatistics import PdfTokensStatistics
 from pdf_token_type_labels.PdfLabels import PdfLabels
 from pdf_token_type_labels.TokenType import TokenType
+from configuration import PDF_FEATURES_BACKEND
 from pdf_tokens_type_trainer.config import (
     XML_NAME,
     LABELS_FILE_NAME,
@@ -35,16 +38,20 @@ class PdfFeatures:
         self.fonts = fonts
         self.file_name = file_name
         self.file_type = file_type
-        self.pdf_modes: PdfModes = PdfModes()
-        self.get_modes()
-        self.get_mode_font()
-        self.get_tokens_context()
+        self.tokens_context_ready = False
 
     def loop_tokens(self):
         for page in self.pages:
             for token in page.tokens:
                 yield page, token
 
+    def get_page_features(self, page: PdfPage) -> "PdfFeatures":
+        page_features = copy.copy(self)
+        page_features.pages = [page]
+        page_features.tokens_statistics = self.tokens_statistics
+        page_features.pdf_modes = self.pdf_modes
+        return page_features
+
     def set_token_types(self, labels: PdfLabels):
         if not labels.pages:
             return
@@ -55,11 +62,12 @@ class PdfFeatures:
     @staticmethod
     def from_poppler_etree(file_path: str | Path, file_name: str | None = None, dataset: str | None = None):
         try:
-            file_content: str = open(file_path, errors="ignore").read()
-        except (FileNotFoundError, UnicodeDecodeError, XMLSyntaxError):
+            with open(file_path, "rb") as xml_file:
+                pages, fonts, _ = PdfFeatures.read_poppler_etree(xml_file, file_name)
+        except FileNotFoundError:
             return None
 
-        return PdfFeatures.from_poppler_etree_content(file_path, file_content, file_name, dataset)
+        return PdfFeatures.from_poppler_pages(file_path, pages, fonts, file_name, dataset)
 
     @staticmethod
     def from_poppler_etree_content(
@@ -68,53 +76,106 @@ class PdfFeatures:
         if not file_content:
             return PdfFeatures.get_empty()
 
-        file_bytes: bytes = file_content.encode("utf-8")
-
-        parser = etree.XMLParser(recover=True, encoding="utf-8")
-        root: ElementBase = etree.fromstring(file_bytes, parser=parser)
+        pages, fonts, _ = PdfFeatures.read_poppler_etree(BytesIO(file_content.encode("utf-8")), file_name)
+        return PdfFeatures.from_poppler_pages(file_path, pages, fonts, file_name, dataset)
 
-        if root is None or not len(root):
+    @staticmethod
+    def from_poppler_pages(
+        file_path: str | Path, pages: list[PdfPage], fonts: list[PdfFont], file_name: str | None, dataset: str | None
+    ):
+        if not pages:
             return PdfFeatures.get_empty()
 
-        fonts: list[PdfFont] = [PdfFont.from_poppler_etree(style_tag) for style_tag in root.findall(".//fontspec")]
-        fonts_by_font_id: dict[str, PdfFont] = {font.font_id: font for font in fonts}
-        tree_pages: list[ElementBase] = [tree_page for tree_page in root.findall(".//page")]
-        pages: list[PdfPage] = [
-            PdfPage.from_poppler_etree(tree_page, fonts_by_font_id, file_name) for tree_page in tree_pages
-        ]
-
-        file_type: str = file_path.split("/")[-2] if not dataset else dataset
+        file_type: str = Path(file_path).parent.name if not dataset else dataset
         file_name: str = Path(file_path).name if not file_name else file_name
 
         return PdfFeatures(pages, fonts, file_name, file_type)
 
     @staticmethod
-    def contains_text(xml_path: str):
+    def read_poppler_etree(xml_source: IO[bytes], pdf_name: str | None) -> tuple[list[PdfPage], list[PdfFont], int]:
+        fonts_by_font_id: dict[str, PdfFont] = dict()
+        pages: list[PdfPage] = list()
+        text_elements_count = 0
+
         try:
-            file_content = open(xml_path).read()
-            file_bytes = file_content.encode("utf-8")
-            root: ElementBase = etree.fromstring(file_bytes)
-            text_elements: list[ElementBase] = root.findall(".//text")
-        except (FileNotFoundError, UnicodeDecodeError, XMLSyntaxError):
-            return False
-        return len(text_elements) > 0
+            for _, element in etree.iterparse(
+                xml_source, events=("end",), tag=("fontspec", "page"), recover=True, encoding="utf-8", huge_tree=True
+            ):
+                if element.tag == "fontspec":
+                    font = PdfFont.from_poppler_etree(element)
+                    fonts_by_font_id[font.font_id] = font
+                    continue
+
+                text_elements_count += len(element.findall(".//text"))
+                pages.append(PdfPage.from_poppler_etree(element, fonts_by_font_id, pdf_name))
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        except XMLSyntaxError:
+            pass
+
+        return pages, list(fonts_by_font_id.values()), text_elements_count
 
     @staticmethod
-    def from_pdf_path(pdf_path, xml_path: str = None):
-        remove_xml = False if xml_path else True
-        xml_path = xml_path if xml_path else join(tempfile.gettempdir(), "pdf_etree.xml")
+    def read_pdftohtml_output(pdf_path: str | Path, xml_path: str | None, hidden: bool):
+        command = ["pdftohtml", "-i"] + (["-hidden"] if hidden else []) + ["-xml", "-zoom", "1.0", str(pdf_path)]
+        pdf_name = Path(pdf_path).name
+
+        if xml_path:
+            subprocess.run(command + [xml_path])
+            try:
+                with open(xml_path, "rb") as xml_file:
+                    return PdfFeatures.read_poppler_etree(xml_file, pdf_name)
+            except FileNotFoundError:
+                return None
+
+        with subprocess.Popen(command + ["-stdout"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as pdftohtml:
+            pdftohtml_output = PdfFeatures.read_poppler_etree(pdftohtml.stdout, pdf_name)
+            pdftohtml.stdout.close()
+
+        if pdftohtml.returncode and not pdftohtml_output[0]:
+            return None
 
-        subprocess.run(["pdftohtml", "-i", "-xml", "-zoom", "1.0", pdf_path, xml_path])
+        return pdftohtml_output
 
-        if not PdfFeatures.contains_text(xml_path):
-            subprocess.run(["pdftohtml", "-i", "-hidden", "-xml", "-zoom", "1.0", pdf_path, xml_path])
+    @staticmethod
+    def from_pymupdf(pdf_path: str | Path, file_name: str | None = None):
+        import pymupdf
 
-        pdf_features = PdfFeatures.from_poppler_etree(xml_path, file_name=Path(pdf_path).name)
+        try:
+            document = pymupdf.open(pdf_path, filetype="pdf")
+        except (pymupdf.FileDataError, RuntimeError, ValueError):
+            return None
+
+        text_flags = pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+        file_name: str = Path(pdf_path).name if not file_name else file_name
+        fonts_by_span_style: dict[tuple, PdfFont] = dict()
+        with document:
+            pages: list[PdfPage] = [
+                PdfPage.from_pymupdf_page(
+                    page.number + 1, page.get_text("dict", flags=text_flags), fonts_by_span_style, file_name
+                )
+                for page in document
+            ]
 
-        if remove_xml and exists(xml_path):
-            os.remove(xml_path)
+        return PdfFeatures(pages, list(fonts_by_span_style.values()), file_name, Path(pdf_path).parent.name)
 
-        return pdf_features
+    @staticmethod
+    def from_pdf_path(pdf_path, xml_path: str = None, backend: str = PDF_FEATURES_BACKEND):
+        if backend == "pymupdf":
+            return PdfFeatures.from_pymupdf(pdf_path)
+
+        pdftohtml_output = PdfFeatures.read_pdftohtml_output(pdf_path, xml_path, hidden=False)
+        if pdftohtml_output and not pdftohtml_output[2]:
+            pdftohtml_output = PdfFeatures.read_pdftohtml_output(pdf_path, xml_path, hidden=True)
+
+        if pdftohtml_output is None:
+            return None
+
+        pages, fonts, _ = pdftohtml_output
+        # Without an xml_path, the XML was written in the temporary folder, which named the file type
+        file_type = Path(xml_path).parent.name if xml_path else Path(tempfile.gettempdir()).name
+        return PdfFeatures.from_poppler_pages(pdf_path, pages, fonts, Path(pdf_path).name, file_type)
 
     @staticmethod
     def from_labeled_data(pdf_labeled_data_root_path: str | Path, dataset: str, pdf_name: str):
@@ -137,46 +198,34 @@ class PdfFeatures:
         labels_dict = json.loads(labels_text)
         return PdfLabels(**labels_dict)
 
-    def get_modes(self):
-        line_spaces, right_spaces = [0], [0]
-
-        for page, token in self.loop_tokens():
-            top, bottom = token.bounding_box.top, token.bounding_box.bottom
-            left, right = token.bounding_box.left, token.bounding_box.right
+    @cached_property
+    def tokens_statistics(self) -> PdfTokensStatistics:
+        return PdfTokensStatistics.from_pages(self.pages)
 
-            on_the_bottom = [page_token for page_token in page.tokens if bottom < page_token.bounding_box.top]
-
-            on_the_right = [
-                line_token
-                for line_token in PdfToken.get_same_line_tokens(token, page.tokens)
-                if right < line_token.bounding_box.left
-            ]
+    @cached_property
+    def pdf_modes(self) -> PdfModes:
+        pdf_modes = PdfModes()
+        pdf_modes.lines_space_mode = PdfTokensStatistics.get_mode(self.tokens_statistics.line_spaces)
+        line_end_rights_mode = PdfTokensStatistics.get_mode(self.tokens_statistics.line_end_rights)
+        pdf_modes.right_space_mode = int(self.pages[0].page_width - line_end_rights_mode) if self.pages else 0
 
-            if len(on_the_bottom):
-                line_spaces.append(min(map(lambda x: int(x.bounding_box.top - bottom), on_the_bottom)))
-
-            if not on_the_right:
-                right_spaces.append(int(right))
+        font_mode_id = PdfTokensStatistics.get_mode(self.tokens_statistics.font_ids, None)
+        font_mode_token = [font for font in self.fonts if font.font_id == font_mode_id]
+        if font_mode_token:
+            pdf_modes.font_size_mode = float(font_mode_token[0].font_size)
 
-        self.pdf_modes.lines_space_mode = mode(line_spaces)
-        self.pdf_modes.right_space_mode = int(self.pages[0].page_width - mode(right_spaces)) if self.pages else 0
+        return pdf_modes
 
-    def get_mode_font(self):
-        fonts_counter: Counter = Counter()
-        for page, token in self.loop_tokens():
-            fonts_counter.update([token.font.font_id])
-
-        if len(fonts_counter.most_common()) == 0:
+    def get_tokens_context(self):
+        if self.tokens_context_ready:
             return
 
-        font_mode_id = fonts_counter.most_common()[0][0]
-        font_mode_token = [font for font in self.fonts if font.font_id == font_mode_id]
-        if font_mode_token:
-            self.pdf_modes.font_size_mode = float(font_mode_token[0].font_size)
+        for page in self.pages:
+            tokens_index = PdfTokensIndex(page.tokens)
+            for token in page.tokens:
+                token.set_context(tokens_index.get_same_line_tokens(token))
 
-    def get_tokens_context(self):
-        for page, token in self.loop_tokens():
-            token.get_context(page.tokens)
+        self.tokens_context_ready = True
 
     @staticmethod
     def get_empty():
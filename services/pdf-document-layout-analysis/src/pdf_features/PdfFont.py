@@ -1,7 +1,12 @@
 from lxml.etree import ElementBase
 
+PYMUPDF_ITALIC_FLAG = 2
+PYMUPDF_BOLD_FLAG = 16
+
 
 class PdfFont:
+    __slots__ = ("font_size", "font_id", "bold", "italics", "color")
+
     def __init__(self, font_id: str, bold: bool, italics: bool, font_size: float, color: str):
         self.font_size = font_size
         self.font_id = font_id
@@ -16,3 +21,24 @@ class PdfFont:
         font_size: float = float(xml_text_style_tag.attrib["size"])
         color: str = "#000000" if "color" not in xml_text_style_tag.attrib else xml_text_style_tag.attrib["color"]
         return PdfFont(xml_text_style_tag.attrib["id"], bold, italics, font_size, color)
+
+    @staticmethod
+    def from_pymupdf_span(font_id: str, span: dict):
+        bold: bool = bool(span["flags"] & PYMUPDF_BOLD_FLAG)
+        italics: bool = bool(span["flags"] & PYMUPDF_ITALIC_FLAG)
+        font_size: float = float(round(span["size"]))
+        color: str = f"#{span['color']:06x}"
+        return PdfFont(font_id, bold, italics, font_size, color)
+
+    @staticmethod
+    def get_pymupdf_span_font(span: dict, fonts_by_span_style: dict[tuple, "PdfFont"]):
+        span_style = (
+            span["font"],
+            span["flags"] & (PYMUPDF_BOLD_FLAG | PYMUPDF_ITALIC_FLAG),
+            round(span["size"]),
+            span["color"],
+        )
+        if span_style not in fonts_by_span_style:
+            fonts_by_span_style[span_style] = PdfFont.from_pymupdf_span(str(len(fonts_by_span_style)), span)
+
+        return fonts_by_span_style[span_style]
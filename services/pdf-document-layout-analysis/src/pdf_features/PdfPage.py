@@ -23,3 +23,18 @@ class PdfPage:
         width = int(xml_page.attrib["width"])
         height = int(xml_page.attrib["height"])
         return PdfPage(page_number, width, height, tokens, pdf_name)
+
+    @staticmethod
+    def from_pymupdf_page(page_number: int, page_dict: dict, fonts_by_span_style: dict[tuple, PdfFont], pdf_name: str):
+        tokens = list()
+        for block in page_dict["blocks"]:
+            for line in block.get("lines", []):
+                for span in line["spans"]:
+                    if not span["text"].strip():
+                        continue
+                    pdf_font = PdfFont.get_pymupdf_span_font(span, fonts_by_span_style)
+                    tokens.append(PdfToken.from_pymupdf_span(page_number, span, pdf_font))
+
+        width = int(page_dict["width"])
+        height = int(page_dict["height"])
+        return PdfPage(page_number, width, height, tokens, pdf_name)
@@ -8,6 +8,18 @@ from pdf_token_type_labels.TokenType import TokenType
 
 
 class PdfToken:
+    __slots__ = (
+        "page_number",
+        "id",
+        "content",
+        "font",
+        "reading_order_no",
+        "bounding_box",
+        "token_type",
+        "pdf_token_context",
+        "prediction",
+    )
+
     def __init__(
         self,
         page_number,
@@ -51,6 +63,12 @@ class PdfToken:
 
         return PdfToken(page_number, tag_id, content, pdf_font, reading_order_no, bounding_box, token_type)
 
+    @staticmethod
+    def from_pymupdf_span(page_number: int, span: dict, pdf_font: PdfFont):
+        content = span["text"].strip()
+        bounding_box = Rectangle.from_pymupdf_bbox(span["bbox"])
+        return PdfToken(page_number, "tag", content, pdf_font, -1, bounding_box, TokenType.TEXT)
+
     def get_label_intersection_percentage(self, label: Label):
         label_bounding_box = Rectangle.from_width_height(
             left=label.left, top=label.top, width=label.width, height=label.height
@@ -70,11 +88,10 @@ class PdfToken:
         return same_line_tokens
 
     def get_context(self, page_tokens: list["PdfToken"]):
-        left, right = self.bounding_box.left, self.bounding_box.right
-
-        self.pdf_token_context.left_of_tokens_on_the_left = left
+        self.set_context(self.get_same_line_tokens(page_tokens))
 
-        same_line_tokens = self.get_same_line_tokens(page_tokens)
+    def set_context(self, same_line_tokens: list["PdfToken"]):
+        left, right = self.bounding_box.left, self.bounding_box.right
 
         on_the_left = [each_token for each_token in same_line_tokens if each_token.bounding_box.right < right]
         on_the_right = [each_token for each_token in same_line_tokens if left < each_token.bounding_box.left]
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class PdfTokenContext:
-    right_of_token_on_the_left = 0
-    left_of_token_on_the_left = 0
-    left_of_token_on_the_right = 0
-    right_of_token_on_the_right = 0
+    right_of_token_on_the_left: int = 0
+    left_of_token_on_the_left: int = 0
+    left_of_token_on_the_right: int = 0
+    right_of_token_on_the_right: int = 0
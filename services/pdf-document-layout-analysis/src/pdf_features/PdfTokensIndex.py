@@ -0,0 +1,29 @@
+from bisect import bisect_left, bisect_right
+
+from pdf_features.PdfToken import PdfToken
+
+
+class PdfTokensIndex:
+    """Page tokens sorted by top and by bottom, to answer the vertical neighbour queries in O(log n + k).
+
+    The results are the same as scanning the whole page with PdfToken.get_same_line_tokens.
+    """
+
+    def __init__(self, page_tokens: list[PdfToken]):
+        self.page_tokens = page_tokens
+        self.indexes_by_top = sorted(range(len(page_tokens)), key=lambda i: page_tokens[i].bounding_box.top)
+        self.tops = [page_tokens[i].bounding_box.top for i in self.indexes_by_top]
+        self.indexes_by_bottom = sorted(range(len(page_tokens)), key=lambda i: page_tokens[i].bounding_box.bottom)
+        self.bottoms = [page_tokens[i].bounding_box.bottom for i in self.indexes_by_bottom]
+
+    def get_same_line_tokens(self, token: PdfToken) -> list[PdfToken]:
+        top, height = token.bounding_box.top, token.bounding_box.height
+        top_starts_inside = self.indexes_by_top[bisect_left(self.tops, top) : bisect_left(self.tops, top + height)]
+        bottom_ends_inside = self.indexes_by_bottom[
+            bisect_right(self.bottoms, top) : bisect_right(self.bottoms, top + height)
+        ]
+        return [self.page_tokens[i] for i in sorted(set(top_starts_inside).union(bottom_ends_inside))]
+
+    def get_closest_top_below(self, bottom: float) -> float | None:
+        closest_index = bisect_right(self.tops, bottom)
+        return self.tops[closest_index] if closest_index < len(self.tops) else None
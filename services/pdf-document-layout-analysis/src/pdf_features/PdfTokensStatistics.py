@@ -0,0 +1,57 @@
+from collections import Counter
+from dataclasses import dataclass, field
+
+from pdf_features.PdfPage import PdfPage
+from pdf_features.PdfTokensIndex import PdfTokensIndex
+
+
+def get_zero_counter() -> Counter:
+    return Counter([0])
+
+
+@dataclass
+class PdfTokensStatistics:
+    """Counts of the token values that the PdfModes and the TOC Modes are taken from, gathered in one pass.
+
+    The counters that used to be lists starting with 0 also start with 0, and Counter.most_common keeps the
+    first value seen among ties, so get_mode returns what statistics.mode returned for those lists.
+    """
+
+    line_spaces: Counter = field(default_factory=get_zero_counter)
+    line_end_rights: Counter = field(default_factory=get_zero_counter)
+    bottoms: Counter = field(default_factory=get_zero_counter)
+    lefts: Counter = field(default_factory=get_zero_counter)
+    right_spaces: Counter = field(default_factory=get_zero_counter)
+    font_sizes: Counter = field(default_factory=Counter)
+    font_ids: Counter = field(default_factory=Counter)
+
+    @staticmethod
+    def get_mode(counter: Counter, default=0):
+        return counter.most_common(1)[0][0] if counter else default
+
+    @staticmethod
+    def from_pages(pages: list[PdfPage]) -> "PdfTokensStatistics":
+        statistics = PdfTokensStatistics()
+        page_width = pages[0].page_width if pages else 0
+        for page in pages:
+            tokens_index = PdfTokensIndex(page.tokens)
+            for token in page.tokens:
+                left, bottom, right = token.bounding_box.left, token.bounding_box.bottom, token.bounding_box.right
+
+                closest_top_below = tokens_index.get_closest_top_below(bottom)
+                if closest_top_below is not None:
+                    statistics.line_spaces[int(closest_top_below - bottom)] += 1
+
+                same_line_tokens = tokens_index.get_same_line_tokens(token)
+                if not any(right < line_token.bounding_box.left for line_token in same_line_tokens):
+                    statistics.line_end_rights[int(right)] += 1
+
+                statistics.bottoms[bottom] += 1
+                statistics.lefts[left] += 1
+                statistics.right_spaces[page_width - right] += 1
+
+                if token.font:
+                    statistics.font_sizes[token.font.font_size] += 1
+                    statistics.font_ids[token.font.font_id] += 1
+
+        return statistics
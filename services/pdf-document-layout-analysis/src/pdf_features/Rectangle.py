@@ -7,6 +7,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 
 
 class Rectangle:
+    __slots__ = ("left", "top", "right", "bottom", "width", "height")
+
     def __init__(self, left: int, top: int, right: int, bottom: int):
         self.left = left
         self.top = top
@@ -25,6 +27,15 @@ class Rectangle:
 
         return Rectangle(x_min, y_min, x_max, y_max)
 
+    @staticmethod
+    def from_pymupdf_bbox(bbox: tuple[float, float, float, float]) -> "Rectangle":
+        x_min = round(bbox[0])
+        y_min = round(bbox[1])
+        x_max = x_min + round(bbox[2] - bbox[0])
+        y_max = y_min + round(bbox[3] - bbox[1])
+
+        return Rectangle(x_min, y_min, x_max, y_max)
+
     def fix_wrong_areas(self):
         if self.right == self.left:
             self.left -= 1
@@ -1,3 +1,4 @@
+import tempfile
 from os.path import join
 from pathlib import Path
 from unittest import TestCase
@@ -19,6 +20,38 @@ class TestPdfFeatures(TestCase):
         self.assertNotEqual(pdf_features_empty, None)
         self.assertNotEqual(pdf_features_empty_list, None)
 
+    def test_file_type(self):
+        pdf_path = join(ROOT_PATH, "test_pdfs", "regular.pdf")
+        self.assertEqual(Path(tempfile.gettempdir()).name, PdfFeatures.from_pdf_path(pdf_path).file_type)
+        with tempfile.TemporaryDirectory() as xmls_path:
+            xml_path = join(xmls_path, "folder", "regular.xml")
+            Path(xml_path).parent.mkdir()
+            self.assertEqual("folder", PdfFeatures.from_pdf_path(pdf_path, xml_path).file_type)
+
     def test_ocr_pdf(self):
         pdf_features = PdfFeatures.from_pdf_path(join(ROOT_PATH, "test_pdfs", "ocr_pdf.pdf"))
         self.assertGreater(len(pdf_features.pages[0].tokens), 0)
+
+    def test_poppler_xml_content(self):
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+<pdf2xml producer="poppler" version="23.08.0">
+<page number="1" position="absolute" top="0" left="0" height="842" width="595">
+    <fontspec id="0" size="12" family="Times-Bold" color="#000000"/>
+<text top="100" left="50" width="80" height="12" font="0"><b>Title</b></text>
+<text top="120" left="50" width="10" height="12" font="0"> </text>
+</page>
+<page number="2" position="absolute" top="0" left="0" height="842" width="595">
+    <fontspec id="1" size="10" family="Times" color="#000000"/>
+<text top="100" left="50" width="200" height="10" font="1">Some text</text>
+<text top="112" left="50" width="200" height="10" font="0">More text</text>
+</page>
+</pdf2xml>"""
+        pdf_features = PdfFeatures.from_poppler_etree_content("/tmp/folder/etree.xml", xml_content)
+
+        self.assertEqual(("etree.xml", "folder"), (pdf_features.file_name, pdf_features.file_type))
+        self.assertEqual(["0", "1"], [font.font_id for font in pdf_features.fonts])
+        self.assertEqual(
+            [["Title"], ["Some text", "More text"]], [[t.content for t in p.tokens] for p in pdf_features.pages]
+        )
+        self.assertTrue(pdf_features.pages[0].tokens[0].font.bold)
+        self.assertEqual(12, pdf_features.pdf_modes.font_size_mode)
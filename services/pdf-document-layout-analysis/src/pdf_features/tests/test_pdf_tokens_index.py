@@ -0,0 +1,63 @@
+from dataclasses import astuple
+import random
+from statistics import mode
+from unittest import TestCase
+
+from pdf_features.PdfFeatures import PdfFeatures
+from pdf_features.PdfFont import PdfFont
+from pdf_features.PdfPage import PdfPage
+from pdf_features.PdfToken import PdfToken
+from pdf_features.PdfTokensIndex import PdfTokensIndex
+from pdf_features.Rectangle import Rectangle
+from pdf_token_type_labels.TokenType import TokenType
+
+
+def get_random_page(page_number: int, tokens_count: int) -> PdfPage:
+    font = PdfFont("0", False, False, 10.0, "#000000")
+    tokens = list()
+    for token_index in range(tokens_count):
+        left, top = random.randint(0, 500), random.choice([random.randint(0, 800), 12 * random.randint(0, 60)])
+        bounding_box = Rectangle.from_width_height(left, top, random.randint(0, 80), random.choice([0, 10, 12, 30]))
+        tokens.append(PdfToken(page_number, "tag", "token", font, token_index, bounding_box, TokenType.TEXT))
+
+    return PdfPage(page_number, 595, 842, tokens, "pdf")
+
+
+def get_modes_scanning_pages(pages: list[PdfPage]):
+    line_spaces, right_spaces = [0], [0]
+    for page in pages:
+        for token in page.tokens:
+            bottom, right = token.bounding_box.bottom, token.bounding_box.right
+            on_the_bottom = [page_token for page_token in page.tokens if bottom < page_token.bounding_box.top]
+            on_the_right = [t for t in token.get_same_line_tokens(page.tokens) if right < t.bounding_box.left]
+            if len(on_the_bottom):
+                line_spaces.append(min(map(lambda x: int(x.bounding_box.top - bottom), on_the_bottom)))
+            if not on_the_right:
+                right_spaces.append(int(right))
+
+    return mode(line_spaces), int(pages[0].page_width - mode(right_spaces))
+
+
+class TestPdfTokensIndex(TestCase):
+    def test_same_line_tokens_match_page_scan(self):
+        random.seed(0)
+        page = get_random_page(1, 400)
+        tokens_index = PdfTokensIndex(page.tokens)
+
+        for token in page.tokens:
+            self.assertEqual(token.get_same_line_tokens(page.tokens), tokens_index.get_same_line_tokens(token))
+
+    def test_features_match_page_scan(self):
+        random.seed(1)
+        pages = [get_random_page(page_number, tokens_count) for page_number, tokens_count in [(1, 300), (2, 0), (3, 50)]]
+        pdf_features = PdfFeatures(pages, [PdfFont("0", False, False, 10.0, "#000000")])
+        pdf_features.get_tokens_context()
+        contexts = [astuple(token.pdf_token_context) for page in pages for token in page.tokens]
+
+        for page in pages:
+            for token in page.tokens:
+                token.get_context(page.tokens)
+
+        self.assertEqual(contexts, [astuple(token.pdf_token_context) for page in pages for token in page.tokens])
+        modes = (pdf_features.pdf_modes.lines_space_mode, pdf_features.pdf_modes.right_space_mode)
+        self.assertEqual(get_modes_scanning_pages(pages), modes)
@@ -0,0 +1,61 @@
+import random
+from dataclasses import astuple
+from statistics import mode
+from unittest import TestCase
+
+from pdf_features.PdfFeatures import PdfFeatures
+from pdf_features.PdfFont import PdfFont
+from pdf_features.PdfPage import PdfPage
+from pdf_features.PdfToken import PdfToken
+from pdf_features.PdfTokenContext import PdfTokenContext
+from pdf_features.Rectangle import Rectangle
+from pdf_token_type_labels.TokenType import TokenType
+from toc.methods.two_models_v3_segments_context_2.Modes import Modes
+
+FONTS = [PdfFont(str(i), False, False, 8.0 + 2 * i, "#000000") for i in range(4)]
+
+
+def get_random_pdf_features() -> PdfFeatures:
+    pages = list()
+    for page_number in range(1, 4):
+        tokens = list()
+        for token_index in range(random.randint(0, 150)):
+            left, top = 10 * random.randint(0, 50), 12 * random.randint(0, 60)
+            bounding_box = Rectangle.from_width_height(left, top, random.randint(1, 90), random.choice([10, 12]))
+            font = random.choice(FONTS)
+            tokens.append(PdfToken(page_number, "tag", "token", font, token_index, bounding_box, TokenType.TEXT))
+        pages.append(PdfPage(page_number, 595, 842, tokens, "pdf"))
+
+    return PdfFeatures(pages, FONTS)
+
+
+class TestPdfTokensStatistics(TestCase):
+    def test_toc_modes(self):
+        random.seed(0)
+        for _ in range(5):
+            pdf_features = get_random_pdf_features()
+            tokens = [token for _, token in pdf_features.loop_tokens()]
+            page_width = pdf_features.pages[0].page_width
+
+            modes = Modes(pdf_features)
+
+            self.assertEqual(mode([0] + [token.bounding_box.bottom for token in tokens]), modes.lines_space_mode)
+            self.assertEqual(mode([0] + [token.bounding_box.left for token in tokens]), modes.left_space_mode)
+            self.assertEqual(mode([0] + [page_width - token.bounding_box.right for token in tokens]), modes.right_space_mode)
+            self.assertEqual(mode([token.font.font_size for token in tokens]) if tokens else 0, modes.font_size_mode)
+            self.assertEqual(mode([token.font.font_id for token in tokens]) if tokens else "", modes.font_family_name_mode)
+
+    def test_lazy_statistics_and_context(self):
+        random.seed(1)
+        pdf_features = get_random_pdf_features()
+
+        self.assertNotIn("pdf_modes", vars(pdf_features))
+        self.assertTrue(all(token.pdf_token_context == PdfTokenContext() for _, token in pdf_features.loop_tokens()))
+
+        page_features = pdf_features.get_page_features(pdf_features.pages[1])
+        self.assertIs(pdf_features.pdf_modes, page_features.pdf_modes)
+
+        pdf_features.get_tokens_context()
+        contexts = [astuple(token.pdf_token_context) for _, token in pdf_features.loop_tokens()]
+        pdf_features.get_tokens_context()
+        self.assertEqual(contexts, [astuple(token.pdf_token_context) for _, token in pdf_features.loop_tokens()])
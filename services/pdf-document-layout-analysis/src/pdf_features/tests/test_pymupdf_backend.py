@@ -0,0 +1,87 @@
+import shutil
+from collections import Counter
+from os.path import join
+from unittest import TestCase, skipIf
+
+from configuration import ROOT_PATH
+from pdf_features.PdfFeatures import PdfFeatures
+from pdf_features.PdfPage import PdfPage
+from pdf_features.Rectangle import Rectangle
+
+TEST_PDFS = ["regular.pdf", "test.pdf", "toc-test.pdf", "some_empty_pages.pdf", "chinese.pdf", "korean.pdf"]
+
+
+def get_words(page: PdfPage) -> Counter:
+    return Counter(word for token in page.tokens for word in token.content.split())
+
+
+def get_words_fonts(page: PdfPage) -> Counter:
+    return Counter((word, token.font.bold, token.font.italics) for token in page.tokens for word in token.content.split())
+
+
+def get_rectangle(segment_box: dict) -> Rectangle:
+    return Rectangle.from_width_height(segment_box["left"], segment_box["top"], segment_box["width"], segment_box["height"])
+
+
+def is_same_segment(segment_box: dict, other_segment_box: dict) -> bool:
+    if (segment_box["page_number"], segment_box["type"]) != (other_segment_box["page_number"], other_segment_box["type"]):
+        return False
+
+    return get_rectangle(segment_box).get_intersection_percentage(get_rectangle(other_segment_box)) >= 50
+
+
+class TestPyMuPDFBackend(TestCase):
+    def test_wrong_pdf(self):
+        not_a_pdf_path = join(ROOT_PATH, "test_pdfs", "not_a_pdf.pdf")
+        self.assertIsNone(PdfFeatures.from_pdf_path(not_a_pdf_path, backend="pymupdf"))
+
+    def test_tokens_and_fonts(self):
+        pdf_features = PdfFeatures.from_pdf_path(join(ROOT_PATH, "test_pdfs", "regular.pdf"), backend="pymupdf")
+        first_token = pdf_features.pages[0].tokens[0]
+
+        self.assertEqual(2, len(pdf_features.pages))
+        self.assertEqual((595, 842), (pdf_features.pages[0].page_width, pdf_features.pages[0].page_height))
+        self.assertEqual("RESOLUCIÓN DE LA", first_token.content)
+        self.assertTrue(first_token.font.bold)
+        self.assertEqual(10, pdf_features.pdf_modes.font_size_mode)
+        self.assertTrue(all(token.content.strip() for page in pdf_features.pages for token in page.tokens))
+
+    @skipIf(shutil.which("pdftohtml") is None, "pdftohtml is not installed")
+    def test_same_output_as_poppler(self):
+        for pdf_name in TEST_PDFS:
+            pdf_path = join(ROOT_PATH, "test_pdfs", pdf_name)
+            poppler_features = PdfFeatures.from_pdf_path(pdf_path, backend="poppler")
+            pymupdf_features = PdfFeatures.from_pdf_path(pdf_path, backend="pymupdf")
+
+            self.assertEqual(len(poppler_features.pages), len(pymupdf_features.pages), pdf_name)
+            self.assertEqual(poppler_features.pdf_modes.font_size_mode, pymupdf_features.pdf_modes.font_size_mode, pdf_name)
+            for poppler_page, pymupdf_page in zip(poppler_features.pages, pymupdf_features.pages):
+                self.assertEqual(poppler_page.page_width, pymupdf_page.page_width, pdf_name)
+                self.assertEqual(poppler_page.page_height, pymupdf_page.page_height, pdf_name)
+
+                poppler_words = get_words(poppler_page)
+                shared_words = sum((poppler_words & get_words(pymupdf_page)).values())
+                self.assertGreaterEqual(shared_words, 0.95 * sum(poppler_words.values()), pdf_name)
+
+                shared_words_fonts = sum((get_words_fonts(poppler_page) & get_words_fonts(pymupdf_page)).values())
+                self.assertGreaterEqual(shared_words_fonts, 0.9 * sum(poppler_words.values()), pdf_name)
+
+    @skipIf(shutil.which("pdftohtml") is None, "pdftohtml is not installed")
+    def test_same_segments_as_poppler(self):
+        from pdf_layout_analysis.run_pdf_layout_analysis_fast import get_segment_boxes
+
+        for pdf_name in TEST_PDFS:
+            pdf_path = join(ROOT_PATH, "test_pdfs", pdf_name)
+            poppler_features = PdfFeatures.from_pdf_path(pdf_path, backend="poppler")
+            pymupdf_features = PdfFeatures.from_pdf_path(pdf_path, backend="pymupdf")
+            poppler_segment_boxes = get_segment_boxes(poppler_features, poppler_features.pages)
+            pymupdf_segment_boxes = get_segment_boxes(pymupdf_features, pymupdf_features.pages)
+
+            same_segments_count = len(
+                [
+                    segment_box
+                    for segment_box in poppler_segment_boxes
+                    if any(is_same_segment(segment_box, other_segment_box) for other_segment_box in pymupdf_segment_boxes)
+                ]
+            )
+            self.assertGreaterEqual(same_segments_count, 0.8 * len(poppler_segment_boxes), pdf_name)
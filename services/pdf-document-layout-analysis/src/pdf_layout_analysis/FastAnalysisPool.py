@@ -0,0 +1,177 @@
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import AnyStr, Iterator
+
+from configuration import service_logger
+from pdf_layout_analysis.pdf_content_to_pdf_path import pdf_content_to_pdf_path
+from pdf_layout_analysis.run_pdf_layout_analysis_fast import analyze_pdf_path_fast_pages, MODEL_PATHS
+from pdf_tokens_type_trainer.PdfTrainer import lightgbm_models
+
+
+WORKERS_WARM_UP_TIMEOUT = 600
+PAGES_QUEUE_TIMEOUT = 1
+
+workers_barrier = None
+
+
+def load_fast_models(lightgbm_threads: int, barrier):
+    global workers_barrier
+    workers_barrier = barrier
+    lightgbm_models.num_threads = lightgbm_threads
+    lightgbm_models.warm_up(MODEL_PATHS)
+
+
+def wait_for_workers() -> bool:
+    workers_barrier.wait(timeout=WORKERS_WARM_UP_TIMEOUT)
+    return lightgbm_models.is_ready()
+
+
+def get_fast_pages(pdf_path: str) -> list[list[dict]]:
+    return list(analyze_pdf_path_fast_pages(pdf_path))
+
+
+def put_fast_pages(pdf_path: str, pages_queue, stopped):
+    try:
+        for page_segment_boxes in analyze_pdf_path_fast_pages(pdf_path, page_by_page=True):
+            if stopped.is_set():
+                return
+            pages_queue.put(page_segment_boxes)
+    finally:
+        pages_queue.put(None)
+
+
+class FastAnalysisPool:
+    """Runs the fast analysis in worker processes, so concurrent requests are not serialized by the GIL.
+
+    Workers are spawned rather than forked from the server, and each one loads and warms the LightGBM models
+    once, predicting with lightgbm_threads threads. warm_up starts all of them and waits until every worker has
+    its models loaded: each worker runs one wait_for_workers task, held by a barrier until all are running.
+    The PDF is handed over as a temporary file path and the segment boxes of all the pages come back together,
+    or, when streaming, page by page through a queue of a manager process, as soon as each page is predicted.
+    A stream abandoned by its client stops its worker at the next page.
+
+    When a worker dies, the pool is broken for every later task, so it is replaced by a new one and the
+    analysis is retried once.
+    """
+
+    def __init__(self, workers_count: int, lightgbm_threads: int = 1):
+        self.workers_count = workers_count
+        self.lightgbm_threads = lightgbm_threads
+        self.executor = self.create_executor()
+        self.manager = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.warm_up_error: Exception | None = None
+
+    def create_executor(self) -> ProcessPoolExecutor:
+        context = get_context("spawn")
+        return ProcessPoolExecutor(
+            max_workers=self.workers_count,
+            mp_context=context,
+            initializer=load_fast_models,
+            initargs=(self.lightgbm_threads, context.Barrier(self.workers_count)),
+        )
+
+    def warm_up(self):
+        try:
+            self.get_manager()
+            workers_ready = [self.executor.submit(wait_for_workers) for _ in range(self.workers_count)]
+            if not all(worker_ready.result() for worker_ready in workers_ready):
+                raise RuntimeError("The LightGBM models could not be loaded in the fast analysis workers")
+        except Exception as exception:
+            self.warm_up_error = exception
+            service_logger.error("Error while starting the fast analysis workers", exc_info=1)
+            return
+
+        self.ready.set()
+        service_logger.info(f"Fast analysis workers ready: {self.workers_count}")
+
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    def has_failed(self) -> bool:
+        return self.warm_up_error is not None
+
+    def restart(self, broken_executor: ProcessPoolExecutor):
+        with self.lock:
+            if self.executor is broken_executor:
+                broken_executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self.create_executor()
+
+    def get_fast_pages(self, pdf_path: str) -> list[list[dict]]:
+        executor = self.executor
+        try:
+            return executor.submit(get_fast_pages, pdf_path).result()
+        except BrokenProcessPool:
+            service_logger.error("A fast analysis worker died, restarting the workers", exc_info=1)
+            self.restart(executor)
+
+        return self.executor.submit(get_fast_pages, pdf_path).result()
+
+    def get_manager(self):
+        with self.lock:
+            if not self.manager:
+                self.manager = get_context("spawn").Manager()
+
+            return self.manager
+
+    def get_worker_pages(self, executor: ProcessPoolExecutor, pdf_path: str) -> Iterator[list[dict]]:
+        manager = self.get_manager()
+        pages_queue = manager.Queue()
+        stopped = manager.Event()
+        future = executor.submit(put_fast_pages, pdf_path, pages_queue, stopped)
+        try:
+            while True:
+                try:
+                    page_segment_boxes = pages_queue.get(timeout=PAGES_QUEUE_TIMEOUT)
+                except queue.Empty:
+                    if future.done():
+                        future.result()
+                    continue
+
+                if page_segment_boxes is None:
+                    break
+
+                yield page_segment_boxes
+
+            future.result()
+        finally:
+            stopped.set()
+
+    def stream_fast_pages(self, pdf_path: str) -> Iterator[list[dict]]:
+        executor = self.executor
+        pages_count = 0
+        try:
+            for page_segment_boxes in self.get_worker_pages(executor, pdf_path):
+                pages_count += 1
+                yield page_segment_boxes
+            return
+        except BrokenProcessPool:
+            service_logger.error("A fast analysis worker died, restarting the workers", exc_info=1)
+            self.restart(executor)
+            if pages_count:
+                raise
+
+        yield from self.get_worker_pages(self.executor, pdf_path)
+
+    def analyze_pdf_fast_pages(self, file: AnyStr, stream: bool = False) -> Iterator[list[dict]]:
+        pdf_path = pdf_content_to_pdf_path(file)
+        try:
+            if stream:
+                yield from self.stream_fast_pages(str(pdf_path))
+                return
+
+            pages = self.get_fast_pages(str(pdf_path))
+        finally:
+            os.remove(pdf_path)
+
+        yield from pages
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.manager:
+            self.manager.shutdown()
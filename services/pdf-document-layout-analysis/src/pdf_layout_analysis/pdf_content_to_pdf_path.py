@@ -0,0 +1,17 @@
+import tempfile
+import uuid
+from os.path import join
+from pathlib import Path
+
+
+def get_file_path(file_name, extension):
+    return join(tempfile.gettempdir(), file_name + "." + extension)
+
+
+def pdf_content_to_pdf_path(file_content):
+    file_id = str(uuid.uuid1())
+
+    pdf_path = Path(get_file_path(file_id, "pdf"))
+    pdf_path.write_bytes(file_content)
+
+    return pdf_path
@@ -1,21 +1,55 @@
 import os
+from itertools import groupby
 from os.path import join
 from pathlib import Path
-from typing import AnyStr
+from typing import AnyStr, Iterator
 
 from fast_trainer.ParagraphExtractorTrainer import ParagraphExtractorTrainer
 from fast_trainer.model_configuration import MODEL_CONFIGURATION as PARAGRAPH_EXTRACTION_CONFIGURATION
 from pdf_features.PdfFeatures import PdfFeatures
-from pdf_layout_analysis.run_pdf_layout_analysis import pdf_content_to_pdf_path
+from pdf_features.PdfPage import PdfPage
+from pdf_layout_analysis.pdf_content_to_pdf_path import pdf_content_to_pdf_path
 from pdf_tokens_type_trainer.TokenTypeTrainer import TokenTypeTrainer
 from pdf_tokens_type_trainer.ModelConfiguration import ModelConfiguration
+from pdf_tokens_type_trainer.PairFeaturesCache import PairFeaturesCache
 
 from configuration import ROOT_PATH, service_logger, XMLS_PATH
 from data_model.SegmentBox import SegmentBox
 
+TOKEN_TYPE_MODEL_PATH = join(ROOT_PATH, "models", "token_type_lightgbm.model")
+PARAGRAPH_EXTRACTION_MODEL_PATH = join(ROOT_PATH, "models", "paragraph_extraction_lightgbm.model")
+MODEL_PATHS = [TOKEN_TYPE_MODEL_PATH, PARAGRAPH_EXTRACTION_MODEL_PATH]
 
-def analyze_pdf_fast(file: AnyStr, xml_file_name: str = "") -> list[dict]:
+
+def get_segment_boxes(pdf_features: PdfFeatures, pages: list[PdfPage]) -> list[dict]:
+    pairs_features_cache = PairFeaturesCache()
+    token_type_trainer = TokenTypeTrainer([pdf_features], ModelConfiguration(), pairs_features_cache)
+    token_type_trainer.set_token_types(TOKEN_TYPE_MODEL_PATH)
+    trainer = ParagraphExtractorTrainer(
+        pdfs_features=[pdf_features],
+        model_configuration=PARAGRAPH_EXTRACTION_CONFIGURATION,
+        pairs_features_cache=pairs_features_cache,
+    )
+    segments = trainer.get_pdf_segments(PARAGRAPH_EXTRACTION_MODEL_PATH)
+    return [SegmentBox.from_pdf_segment(pdf_segment, pages).to_dict() for pdf_segment in segments]
+
+
+def analyze_pdf_fast_pages(file: AnyStr, xml_file_name: str = "", page_by_page: bool = False) -> Iterator[list[dict]]:
     pdf_path = pdf_content_to_pdf_path(file)
+    try:
+        yield from analyze_pdf_path_fast_pages(pdf_path, xml_file_name, page_by_page)
+    finally:
+        os.remove(pdf_path)
+
+
+def analyze_pdf_path_fast_pages(
+    pdf_path: str | Path, xml_file_name: str = "", page_by_page: bool = False
+) -> Iterator[list[dict]]:
+    """Segment boxes of the pages of the PDF, grouped by page.
+
+    By default both models predict the whole document at once. With page_by_page, used when streaming, each page
+    is predicted on its own and yielded as soon as it is done, at the cost of two predictions per page.
+    """
     service_logger.info("Creating Paragraph Tokens [fast]")
 
     xml_path = Path(join(XMLS_PATH, xml_file_name)) if xml_file_name else None
@@ -24,8 +58,19 @@ def analyze_pdf_fast(file: AnyStr, xml_file_name: str = "") -> list[dict]:
         os.makedirs(xml_path.parent, exist_ok=True)
 
     pdf_features = PdfFeatures.from_pdf_path(pdf_path, str(xml_path) if xml_path else None)
-    token_type_trainer = TokenTypeTrainer([pdf_features], ModelConfiguration())
-    token_type_trainer.set_token_types(join(ROOT_PATH, "models", "token_type_lightgbm.model"))
-    trainer = ParagraphExtractorTrainer(pdfs_features=[pdf_features], model_configuration=PARAGRAPH_EXTRACTION_CONFIGURATION)
-    segments = trainer.get_pdf_segments(join(ROOT_PATH, "models", "paragraph_extraction_lightgbm.model"))
-    return [SegmentBox.from_pdf_segment(pdf_segment, pdf_features.pages).to_dict() for pdf_segment in segments]
+    if not page_by_page:
+        segment_boxes = get_segment_boxes(pdf_features, pdf_features.pages)
+        for _, page_segment_boxes in groupby(segment_boxes, key=lambda segment_box: segment_box["page_number"]):
+            yield list(page_segment_boxes)
+        return
+
+    for page in pdf_features.pages:
+        yield get_segment_boxes(pdf_features.get_page_features(page), pdf_features.pages)
+
+
+def analyze_pdf_fast(file: AnyStr, xml_file_name: str = "") -> list[dict]:
+    return [
+        segment_box
+        for page_segment_boxes in analyze_pdf_fast_pages(file, xml_file_name)
+        for segment_box in page_segment_boxes
+    ]
@@ -0,0 +1,37 @@
+import shutil
+from os.path import join
+from unittest import TestCase, skipIf
+
+from configuration import ROOT_PATH
+from pdf_layout_analysis.FastAnalysisPool import FastAnalysisPool
+from pdf_layout_analysis.run_pdf_layout_analysis_fast import analyze_pdf_fast_pages
+
+
+@skipIf(not shutil.which("pdftohtml"), "pdftohtml is not installed")
+class TestFastAnalysisPool(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fast_analysis_pool = FastAnalysisPool(1)
+        cls.fast_analysis_pool.warm_up()
+        with open(join(ROOT_PATH, "test_pdfs", "regular.pdf"), "rb") as file:
+            cls.file_content = file.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.fast_analysis_pool.shutdown()
+
+    def test_same_pages_as_in_process_analysis(self):
+        expected_pages = list(analyze_pdf_fast_pages(self.file_content))
+        self.assertEqual(expected_pages, list(self.fast_analysis_pool.analyze_pdf_fast_pages(self.file_content)))
+
+    def test_stream_pages(self):
+        expected_pages = list(analyze_pdf_fast_pages(self.file_content, page_by_page=True))
+        pages = self.fast_analysis_pool.analyze_pdf_fast_pages(self.file_content, stream=True)
+        self.assertEqual(expected_pages, list(pages))
+
+    def test_abandoned_stream(self):
+        pages = self.fast_analysis_pool.analyze_pdf_fast_pages(self.file_content, stream=True)
+        self.assertTrue(next(pages))
+        pages.close()
+
+        self.assertEqual(2, len(list(self.fast_analysis_pool.analyze_pdf_fast_pages(self.file_content, stream=True))))
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+import lightgbm as lgb
+import numpy as np
+
+from batching.MicroBatcher import MicroBatcher
+from configuration import service_logger
+
+
+class LightGBMModels:
+    """Process wide registry of LightGBM boosters, loaded and warmed once per model file.
+
+    Each booster is kept with the modification time of its file, checked at most once per check_interval
+    seconds, so a model replaced on disk is loaded again on its first use after the check. Predictions run with num_threads threads (0 lets LightGBM decide).
+
+    With max_batch_rows > 0, the feature matrices of concurrent predict calls on the same model are stacked
+    by a MicroBatcher into one Booster.predict of up to max_batch_rows rows, and the probabilities are split
+    back per call.
+    """
+
+    def __init__(
+        self,
+        num_threads: int = 0,
+        max_batch_rows: int = 0,
+        batch_wait_time: float = 0,
+        check_interval: float = 0,
+    ):
+        self.num_threads = num_threads
+        self.max_batch_rows = max_batch_rows
+        self.batch_wait_time = batch_wait_time
+        self.check_interval = check_interval
+        self.boosters: dict[str, tuple[int, float, lgb.Booster]] = dict()
+        self.batchers: dict[str, MicroBatcher] = dict()
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.warm_up_error: Exception | None = None
+
+    def load(self, model_path: str | Path) -> lgb.Booster:
+        model_path = str(model_path)
+        loaded_booster = self.boosters.get(model_path)
+        if loaded_booster and time.monotonic() - loaded_booster[1] < self.check_interval:
+            return loaded_booster[2]
+
+        modification_time = os.stat(model_path).st_mtime_ns
+        with self.lock:
+            if model_path in self.boosters and self.boosters[model_path][0] == modification_time:
+                booster = self.boosters[model_path][2]
+                self.boosters[model_path] = (modification_time, time.monotonic(), booster)
+                return booster
+
+            if model_path in self.boosters:
+                service_logger.info(f"Reloading LightGBM model {model_path}")
+
+            booster = lgb.Booster(model_file=model_path)
+            booster.predict(np.zeros((1, booster.num_feature())), num_threads=self.num_threads)
+            self.boosters[model_path] = (modification_time, time.monotonic(), booster)
+            return booster
+
+    def warm_up(self, model_paths: list[str | Path]):
+        try:
+            for model_path in model_paths:
+                self.load(model_path)
+        except Exception as exception:
+            self.warm_up_error = exception
+            service_logger.error("Error while loading the LightGBM models", exc_info=1)
+            return
+
+        self.ready.set()
+        service_logger.info(f"LightGBM models ready: {len(self.boosters)}")
+
+    def is_ready(self) -> bool:
+        return self.ready.is_set()
+
+    def has_failed(self) -> bool:
+        return self.warm_up_error is not None
+
+    def get_batcher(self, model_path: str) -> MicroBatcher:
+        with self.lock:
+            if model_path not in self.batchers:
+                self.batchers[model_path] = MicroBatcher(
+                    partial(self.predict_batch, model_path),
+                    self.max_batch_rows,
+                    self.batch_wait_time,
+                    get_item_size=len,
+                    name=f"lightgbm_batcher_{Path(model_path).stem}",
+                )
+            return self.batchers[model_path]
+
+    def predict_batch(self, model_path: str, xs: list[np.ndarray]) -> list[np.ndarray]:
+        predictions = self.load(model_path).predict(np.concatenate(xs), num_threads=self.num_threads)
+        return np.split(predictions, np.cumsum([len(x) for x in xs[:-1]]))
+
+    def predict(self, model_path: str | Path, x: np.ndarray) -> np.ndarray:
+        if self.max_batch_rows <= 0:
+            return self.load(model_path).predict(x, num_threads=self.num_threads)
+
+        return self.get_batcher(str(model_path)).submit(x).result()
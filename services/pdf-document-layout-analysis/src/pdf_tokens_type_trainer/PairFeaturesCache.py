@@ -0,0 +1,29 @@
+import numpy as np
+
+from pdf_features.PdfPage import PdfPage
+
+
+class PairFeaturesCache:
+    """Keeps the VectorizedTokenFeatures pair features of each page for the trainers that run on the same pages.
+
+    Pair features do not depend on token types and padding tokens are all alike, so the pairs of a smaller
+    context size are the middle of the pairs computed with a larger one: the paragraph extraction pair q
+    (context 1) is the token type pair q + 3 (context 4).
+    """
+
+    def __init__(self):
+        self.pairs_features_by_page: dict[int, tuple[PdfPage, int, np.ndarray]] = dict()
+
+    def get(self, page: PdfPage, context_size: int) -> np.ndarray | None:
+        if id(page) not in self.pairs_features_by_page:
+            return None
+
+        cached_page, cached_context_size, pairs_features = self.pairs_features_by_page[id(page)]
+        if cached_page is not page or cached_context_size < context_size:
+            return None
+
+        offset = cached_context_size - context_size
+        return pairs_features[offset : len(pairs_features) - offset]
+
+    def set(self, page: PdfPage, context_size: int, pairs_features: np.ndarray):
+        self.pairs_features_by_page[id(page)] = (page, context_size, pairs_features)
@@ -5,19 +5,38 @@ from pathlib import Path
 import lightgbm as lgb
 import numpy as np
 
+from configuration import (
+    LIGHTGBM_NUM_THREADS,
+    LIGHTGBM_MAX_BATCH_ROWS,
+    LIGHTGBM_BATCH_WAIT_TIME,
+    MODELS_CHECK_INTERVAL,
+)
 from pdf_features.PdfFeatures import PdfFeatures
 from pdf_features.PdfFont import PdfFont
 from pdf_features.PdfToken import PdfToken
 from pdf_features.Rectangle import Rectangle
 from pdf_token_type_labels.TokenType import TokenType
+from pdf_tokens_type_trainer.LightGBMModels import LightGBMModels
 from pdf_tokens_type_trainer.ModelConfiguration import ModelConfiguration
+from pdf_tokens_type_trainer.PairFeaturesCache import PairFeaturesCache
 from pdf_tokens_type_trainer.download_models import pdf_tokens_type_model
 
 
+lightgbm_models = LightGBMModels(
+    LIGHTGBM_NUM_THREADS, LIGHTGBM_MAX_BATCH_ROWS, LIGHTGBM_BATCH_WAIT_TIME, MODELS_CHECK_INTERVAL
+)
+
+
 class PdfTrainer:
-    def __init__(self, pdfs_features: list[PdfFeatures], model_configuration: ModelConfiguration = None):
+    def __init__(
+        self,
+        pdfs_features: list[PdfFeatures],
+        model_configuration: ModelConfiguration = None,
+        pairs_features_cache: PairFeaturesCache | None = None,
+    ):
         self.pdfs_features = pdfs_features
         self.model_configuration = model_configuration if model_configuration else ModelConfiguration()
+        self.pairs_features_cache = pairs_features_cache
 
     def get_model_input(self) -> np.ndarray:
         pass
@@ -77,8 +96,7 @@ class PdfTrainer:
         if not x.any():
             return self.pdfs_features
 
-        lightgbm_model = lgb.Booster(model_file=model_path)
-        return lightgbm_model.predict(x)
+        return lightgbm_models.predict(model_path, x)
 
     def save_training_data(self, save_folder_path: str | Path, labels: list[int]):
         os.makedirs(save_folder_path, exist_ok=True)
@@ -3,12 +3,23 @@ import unicodedata
 
 from pdf_features.PdfFeatures import PdfFeatures
 from pdf_features.PdfToken import PdfToken
+from pdf_tokens_type_trainer.TopDistanceIndex import TopDistanceIndex
 from pdf_tokens_type_trainer.config import CHARACTER_TYPE
 
 
 class TokenFeatures:
     def __init__(self, pdfs_features: PdfFeatures):
         self.pdfs_features = pdfs_features
+        self.pdfs_features.get_tokens_context()
+        self.indexed_page_tokens: list[PdfToken] | None = None
+        self.top_distance_index: TopDistanceIndex | None = None
+
+    def get_top_distance_index(self, page_tokens: list[PdfToken]) -> TopDistanceIndex:
+        if page_tokens is not self.indexed_page_tokens:
+            self.indexed_page_tokens = page_tokens
+            self.top_distance_index = TopDistanceIndex(page_tokens)
+
+        return self.top_distance_index
 
     def get_features(self, token_1: PdfToken, token_2: PdfToken, page_tokens: list[PdfToken]):
         same_font = True if token_1.font.font_id == token_2.font.font_id else False
@@ -54,7 +65,7 @@ class TokenFeatures:
         right_distance, left_distance, height_difference = left_2 - left_1 - width_1, left_1 - left_2, height_1 - height_2
 
         top_distance = token_2.bounding_box.top - token_1.bounding_box.top - height_1
-        top_distance_gaps = self.get_top_distance_gap(token_1, token_2, page_tokens)
+        top_distance_gaps = self.get_top_distance_index(page_tokens).get_top_distance_gap(token_1, token_2)
 
         start_lines_differences = absolute_left_1 - absolute_left_2
         end_lines_difference = abs(absolute_right_1 - absolute_right_2)
@@ -3,35 +3,62 @@ from pathlib import Path
 import numpy as np
 from tqdm import tqdm
 
+from pdf_features.PdfPage import PdfPage
 from pdf_features.PdfToken import PdfToken
 from pdf_token_type_labels.TokenType import TokenType
 from pdf_tokens_type_trainer.PdfTrainer import PdfTrainer
 from pdf_tokens_type_trainer.TokenFeatures import TokenFeatures
+from pdf_tokens_type_trainer.VectorizedTokenFeatures import VectorizedTokenFeatures
 
 
 class TokenTypeTrainer(PdfTrainer):
     def get_model_input(self) -> np.ndarray:
-        features_rows = []
+        pages_rows = []
 
         contex_size = self.model_configuration.context_size
         for token_features, page in self.loop_token_features():
-            page_tokens = [
-                self.get_padding_token(segment_number=i - 999999, page_number=page.page_number) for i in range(contex_size)
-            ]
-            page_tokens += page.tokens
-            page_tokens += [
-                self.get_padding_token(segment_number=999999 + i, page_number=page.page_number) for i in range(contex_size)
-            ]
+            page_tokens = self.get_padded_page_tokens(page, contex_size)
+            pairs_features = self.get_pairs_features(token_features, page, page_tokens)
+            pages_rows.append(token_features.get_context_windows(pairs_features, contex_size))
 
-            tokens_indexes = range(contex_size, len(page_tokens) - contex_size)
-            page_features = [self.get_context_features(token_features, page_tokens, i) for i in tokens_indexes]
-            features_rows.extend(page_features)
+        if not pages_rows:
+            return np.zeros((0, 0))
 
-        return self.features_rows_to_x(features_rows)
+        return np.concatenate(pages_rows)
+
+    def get_padded_page_tokens(self, page: PdfPage, contex_size: int) -> list[PdfToken]:
+        page_tokens = [
+            self.get_padding_token(segment_number=i - 999999, page_number=page.page_number) for i in range(contex_size)
+        ]
+        page_tokens += page.tokens
+        page_tokens += [
+            self.get_padding_token(segment_number=999999 + i, page_number=page.page_number) for i in range(contex_size)
+        ]
+        return page_tokens
+
+    def get_base_pairs_features(
+        self, token_features: VectorizedTokenFeatures, page: PdfPage, page_tokens: list[PdfToken]
+    ) -> np.ndarray:
+        context_size = self.model_configuration.context_size
+        if self.pairs_features_cache:
+            pairs_features = self.pairs_features_cache.get(page, context_size)
+            if pairs_features is not None:
+                return pairs_features
+
+        pairs_features = token_features.get_pairs_features(page_tokens)
+        if self.pairs_features_cache:
+            self.pairs_features_cache.set(page, context_size, pairs_features)
+
+        return pairs_features
+
+    def get_pairs_features(
+        self, token_features: VectorizedTokenFeatures, page: PdfPage, page_tokens: list[PdfToken]
+    ) -> np.ndarray:
+        return self.get_base_pairs_features(token_features, page, page_tokens)
 
     def loop_token_features(self):
         for pdf_features in tqdm(self.pdfs_features):
-            token_features = TokenFeatures(pdf_features)
+            token_features = VectorizedTokenFeatures(pdf_features)
 
             for page in pdf_features.pages:
                 if not page.tokens:
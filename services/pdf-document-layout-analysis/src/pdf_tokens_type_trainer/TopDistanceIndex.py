@@ -0,0 +1,62 @@
+import numpy as np
+
+from pdf_features.PdfToken import PdfToken
+
+
+class TopDistanceIndex:
+    """Answers TokenFeatures.get_top_distance_gap in O(log n) for the tokens of one page.
+
+    Tokens are sorted by top, so the tokens in the middle of a pair are a contiguous range: their smallest
+    top is the first one of the range and their largest bottom comes from a sparse table of range maximums.
+    """
+
+    def __init__(self, page_tokens: list[PdfToken]):
+        tops = np.array([token.bounding_box.top for token in page_tokens], dtype=np.float64)
+        bottoms = np.array([token.bounding_box.bottom for token in page_tokens], dtype=np.float64)
+        order = np.argsort(tops, kind="stable")
+        self.tops = tops[order]
+        self.max_bottoms = self.get_sparse_table(bottoms[order])
+
+    @staticmethod
+    def get_sparse_table(values: np.ndarray) -> np.ndarray:
+        levels_count = max(1, int(len(values)).bit_length())
+        sparse_table = np.full((levels_count, len(values)), -np.inf)
+        sparse_table[0] = values
+        for level in range(1, levels_count):
+            half = 1 << (level - 1)
+            sparse_table[level, : len(values) - 2 * half + 1] = np.maximum(
+                sparse_table[level - 1, : len(values) - 2 * half + 1], sparse_table[level - 1, half : len(values) - half + 1]
+            )
+
+        return sparse_table
+
+    def get_top_distance_gaps(
+        self, tops_1: np.ndarray, heights_1: np.ndarray, bottoms_1: np.ndarray, tops_2: np.ndarray
+    ) -> np.ndarray:
+        top_distances = tops_2 - tops_1 - heights_1
+        starts = np.searchsorted(self.tops, bottoms_1, side="left")
+        ends = np.maximum(starts, np.searchsorted(self.tops, tops_2, side="left"))
+        with_tokens_in_the_middle = starts < ends
+
+        gap_middle_top = np.zeros(len(tops_1))
+        gap_middle_bottom = np.zeros(len(tops_1))
+        starts, ends = starts[with_tokens_in_the_middle], ends[with_tokens_in_the_middle]
+        if len(starts):
+            levels = np.frexp(ends - starts)[1] - 1
+            middle_bottoms = np.maximum(self.max_bottoms[levels, starts], self.max_bottoms[levels, ends - (1 << levels)])
+            middle_tops = self.tops[starts]
+            gap_middle_top[with_tokens_in_the_middle] = (
+                middle_tops - tops_1[with_tokens_in_the_middle] - heights_1[with_tokens_in_the_middle]
+            )
+            gap_middle_bottom[with_tokens_in_the_middle] = tops_2[with_tokens_in_the_middle] - middle_bottoms
+
+        return top_distances - (gap_middle_bottom - gap_middle_top)
+
+    def get_top_distance_gap(self, token_1: PdfToken, token_2: PdfToken) -> float:
+        top_distance_gaps = self.get_top_distance_gaps(
+            np.array([token_1.bounding_box.top], dtype=np.float64),
+            np.array([token_1.bounding_box.height], dtype=np.float64),
+            np.array([token_1.bounding_box.bottom], dtype=np.float64),
+            np.array([token_2.bounding_box.top], dtype=np.float64),
+        )
+        return float(top_distance_gaps[0])
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os.path import join
+from unittest import TestCase
+
+import lightgbm as lgb
+import numpy as np
+
+from pdf_tokens_type_trainer.LightGBMModels import LightGBMModels
+
+
+def save_model(model_path: str, labels: np.ndarray, x: np.ndarray):
+    params = {"objective": "binary", "num_iterations": 5, "min_data_in_leaf": 1, "verbose": -1}
+    lgb.train(params, lgb.Dataset(x, labels)).save_model(model_path)
+
+
+class TestLightGBMModels(TestCase):
+    def test_warm_up_and_predict(self):
+        x = np.random.default_rng(0).random((50, 3))
+        with tempfile.TemporaryDirectory() as model_folder:
+            model_path = join(model_folder, "model.txt")
+            save_model(model_path, x[:, 0] > 0.5, x)
+            lightgbm_models = LightGBMModels(num_threads=1)
+
+            self.assertFalse(lightgbm_models.is_ready())
+            lightgbm_models.warm_up([model_path])
+            self.assertTrue(lightgbm_models.is_ready())
+
+            expected = lgb.Booster(model_file=model_path).predict(x)
+            self.assertTrue(np.array_equal(expected, lightgbm_models.predict(model_path, x)))
+            self.assertIs(lightgbm_models.load(model_path), lightgbm_models.load(model_path))
+
+    def test_failed_warm_up(self):
+        with tempfile.TemporaryDirectory() as model_folder:
+            lightgbm_models = LightGBMModels(num_threads=1)
+            lightgbm_models.warm_up([join(model_folder, "missing_model.txt")])
+
+            self.assertFalse(lightgbm_models.is_ready())
+            self.assertTrue(lightgbm_models.has_failed())
+
+    def test_reload_changed_model(self):
+        x = np.random.default_rng(1).random((50, 3))
+        with tempfile.TemporaryDirectory() as model_folder:
+            model_path = join(model_folder, "model.txt")
+            save_model(model_path, x[:, 0] > 0.5, x)
+            lightgbm_models = LightGBMModels(num_threads=1)
+            first_booster = lightgbm_models.load(model_path)
+
+            save_model(model_path, x[:, 1] > 0.5, x)
+            os.utime(model_path, ns=(0, os.stat(model_path).st_mtime_ns + 1))
+
+            self.assertIsNot(first_booster, lightgbm_models.load(model_path))
+            expected = lgb.Booster(model_file=model_path).predict(x)
+            self.assertTrue(np.array_equal(expected, lightgbm_models.predict(model_path, x)))
+
+    def test_model_file_is_checked_once_per_interval(self):
+        x = np.random.default_rng(3).random((50, 3))
+        with tempfile.TemporaryDirectory() as model_folder:
+            model_path = join(model_folder, "model.txt")
+            save_model(model_path, x[:, 0] > 0.5, x)
+            lightgbm_models = LightGBMModels(num_threads=1, check_interval=3600)
+            first_booster = lightgbm_models.load(model_path)
+
+            os.remove(model_path)
+            self.assertIs(first_booster, lightgbm_models.load(model_path))
+            self.assertEqual(len(x), len(lightgbm_models.predict(model_path, x)))
+
+    def test_batched_predictions(self):
+        x = np.random.default_rng(2).random((400, 3))
+        with tempfile.TemporaryDirectory() as model_folder:
+            model_path = join(model_folder, "model.txt")
+            save_model(model_path, x[:, 0] > 0.5, x)
+            lightgbm_models = LightGBMModels(num_threads=1, max_batch_rows=100, batch_wait_time=0.01)
+            requests_x = np.split(x, [1, 30, 31, 90, 200, 260])
+
+            with ThreadPoolExecutor(max_workers=len(requests_x)) as executor:
+                predictions = list(executor.map(partial(lightgbm_models.predict, model_path), requests_x))
+
+            expected = lgb.Booster(model_file=model_path).predict(x)
+            self.assertEqual([len(request_x) for request_x in requests_x], [len(p) for p in predictions])
+            self.assertTrue(np.allclose(expected, np.concatenate(predictions)))
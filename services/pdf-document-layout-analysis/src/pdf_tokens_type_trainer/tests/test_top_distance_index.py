@@ -0,0 +1,34 @@
+import random
+from unittest import TestCase
+
+from pdf_features.PdfFont import PdfFont
+from pdf_features.PdfToken import PdfToken
+from pdf_features.Rectangle import Rectangle
+from pdf_token_type_labels.TokenType import TokenType
+from pdf_tokens_type_trainer.TokenFeatures import TokenFeatures
+from pdf_tokens_type_trainer.TopDistanceIndex import TopDistanceIndex
+
+
+def get_random_tokens(tokens_count: int) -> list[PdfToken]:
+    font = PdfFont("0", False, False, 10.0, "#000000")
+    tokens = list()
+    for token_index in range(tokens_count):
+        top = random.choice([-1, 12 * random.randint(0, 70), random.randint(0, 840)])
+        bounding_box = Rectangle.from_width_height(random.randint(0, 500), top, 40, random.choice([2, 10, 12, 40]))
+        tokens.append(PdfToken(1, "tag", "token", font, token_index, bounding_box, TokenType.TEXT))
+
+    return tokens
+
+
+class TestTopDistanceIndex(TestCase):
+    def test_same_gaps_as_page_scan(self):
+        random.seed(0)
+        for tokens_count in [1, 2, 3, 17, 300]:
+            page_tokens = get_random_tokens(tokens_count)
+            top_distance_index = TopDistanceIndex(page_tokens)
+            pairs = list(zip(page_tokens, page_tokens[1:])) + [(page_tokens[0], page_tokens[0])]
+            pairs += [(random.choice(page_tokens), random.choice(page_tokens)) for _ in range(tokens_count)]
+
+            for token_1, token_2 in pairs:
+                expected_gap = TokenFeatures.get_top_distance_gap(token_1, token_2, page_tokens)
+                self.assertEqual(expected_gap, top_distance_index.get_top_distance_gap(token_1, token_2))
@@ -0,0 +1,82 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from fast_trainer.ParagraphExtractorTrainer import ParagraphExtractorTrainer
+from fast_trainer.model_configuration import MODEL_CONFIGURATION as PARAGRAPH_EXTRACTION_CONFIGURATION
+from pdf_features.PdfFeatures import PdfFeatures
+from pdf_features.PdfFont import PdfFont
+from pdf_features.PdfPage import PdfPage
+from pdf_features.PdfToken import PdfToken
+from pdf_features.Rectangle import Rectangle
+from pdf_token_type_labels.TokenType import TokenType
+from pdf_tokens_type_trainer.ModelConfiguration import ModelConfiguration
+from pdf_tokens_type_trainer.PairFeaturesCache import PairFeaturesCache
+from pdf_tokens_type_trainer.TokenTypeTrainer import TokenTypeTrainer
+
+CONTENTS = ["Title", "1.", "Some text, with punctuation!", "ñandú", "数据", "(a)", "x", "  spaced  out  ", "§ 12"]
+
+
+def get_random_pdf_features(tokens_per_page: list[int]) -> PdfFeatures:
+    fonts = [PdfFont(str(i), i == 0, i == 1, 8.0 + i, "#000000") for i in range(3)]
+    pages = list()
+    for page_number, tokens_count in enumerate(tokens_per_page, start=1):
+        tokens = list()
+        for token_index in range(tokens_count):
+            left, top = random.randint(0, 500), 12 * random.randint(0, 60) + random.choice([0, 0, 3])
+            bounding_box = Rectangle.from_width_height(left, top, random.randint(1, 90), random.choice([10, 12, 20]))
+            token_type = random.choice(list(TokenType))
+            content = random.choice(CONTENTS)
+            font = random.choice(fonts)
+            tokens.append(PdfToken(page_number, "tag", content, font, token_index, bounding_box, token_type))
+        pages.append(PdfPage(page_number, 595, 842, tokens, "pdf"))
+
+    return PdfFeatures(pages, fonts, "pdf")
+
+
+def get_rows_model_input(trainer: TokenTypeTrainer) -> np.ndarray:
+    features_rows = []
+    context_size = trainer.model_configuration.context_size
+    for token_features, page in trainer.loop_token_features():
+        page_tokens = trainer.get_padded_page_tokens(page, context_size)
+        tokens_indexes = range(context_size, len(page_tokens) - context_size)
+        features_rows.extend([trainer.get_context_features(token_features, page_tokens, i) for i in tokens_indexes])
+
+    return trainer.features_rows_to_x(features_rows)
+
+
+class TestVectorizedTokenFeatures(TestCase):
+    def test_token_type_model_input(self):
+        random.seed(0)
+        trainer = TokenTypeTrainer([get_random_pdf_features([120, 0, 1, 7])], ModelConfiguration())
+
+        vectorized_model_input = trainer.get_model_input()
+
+        self.assertEqual((128, 8 * 246), vectorized_model_input.shape)
+        self.assertTrue(np.array_equal(get_rows_model_input(trainer), vectorized_model_input))
+
+    def test_paragraph_extraction_model_input(self):
+        random.seed(1)
+        pdfs_features = [get_random_pdf_features([60, 2]), get_random_pdf_features([15])]
+        trainer = ParagraphExtractorTrainer(pdfs_features, PARAGRAPH_EXTRACTION_CONFIGURATION)
+
+        vectorized_model_input = trainer.get_model_input()
+
+        self.assertEqual((77, 2 * (246 + 2 * len(TokenType))), vectorized_model_input.shape)
+        self.assertTrue(np.array_equal(get_rows_model_input(trainer), vectorized_model_input))
+
+    def test_paragraph_extraction_model_input_from_token_type_pairs(self):
+        random.seed(2)
+        pdfs_features = [get_random_pdf_features([40, 1, 3])]
+        pairs_features_cache = PairFeaturesCache()
+        TokenTypeTrainer(pdfs_features, ModelConfiguration(), pairs_features_cache).get_model_input()
+
+        trainer = ParagraphExtractorTrainer(pdfs_features, PARAGRAPH_EXTRACTION_CONFIGURATION, pairs_features_cache)
+
+        self.assertEqual(3, len(pairs_features_cache.pairs_features_by_page))
+        self.assertTrue(np.array_equal(get_rows_model_input(trainer), trainer.get_model_input()))
+
+    def test_empty_pdf(self):
+        trainer = TokenTypeTrainer([get_random_pdf_features([0, 0])], ModelConfiguration())
+        self.assertEqual((0, 0), trainer.get_model_input().shape)
@@ -0,0 +1,8 @@
+class CacheTier:
+    name: str = "cache_tier"
+
+    def get(self, key: str) -> list[dict] | None:
+        pass
+
+    def set(self, key: str, segment_boxes: list[dict]):
+        pass
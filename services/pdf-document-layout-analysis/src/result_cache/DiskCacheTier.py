@@ -0,0 +1,61 @@
+import gzip
+import json
+import os
+import threading
+import uuid
+from os.path import join
+from pathlib import Path
+
+from result_cache.CacheTier import CacheTier
+
+
+class DiskCacheTier(CacheTier):
+    """Stores each result as a gzipped JSON file. When the folder grows over max_bytes, the least recently
+    used files are removed; reading a file refreshes its modification time."""
+
+    name = "disk"
+
+    def __init__(self, cache_path: str | Path, max_bytes: int):
+        self.cache_path = Path(cache_path)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_path, exist_ok=True)
+        self.total_bytes = sum(file_path.stat().st_size for file_path in self.cache_path.glob("*.json.gz"))
+
+    def get_file_path(self, key: str) -> Path:
+        return Path(join(self.cache_path, f"{key}.json.gz"))
+
+    def get(self, key: str) -> list[dict] | None:
+        file_path = self.get_file_path(key)
+        try:
+            segment_boxes = json.loads(gzip.decompress(file_path.read_bytes()))
+            os.utime(file_path)
+        except (OSError, EOFError, ValueError):
+            return None
+
+        return segment_boxes
+
+    def set(self, key: str, segment_boxes: list[dict]):
+        content = gzip.compress(json.dumps(segment_boxes).encode())
+        if len(content) > self.max_bytes:
+            return
+
+        file_path = self.get_file_path(key)
+        temporary_path = Path(join(self.cache_path, f"{key}.{uuid.uuid1()}.tmp"))
+        temporary_path.write_bytes(content)
+        with self.lock:
+            previous_size = file_path.stat().st_size if file_path.exists() else 0
+            os.replace(temporary_path, file_path)
+            self.total_bytes += len(content) - previous_size
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        files = sorted(self.cache_path.glob("*.json.gz"), key=lambda cached_file: cached_file.stat().st_mtime_ns)
+        self.total_bytes = sum(cached_file.stat().st_size for cached_file in files)
+        for cached_file in files:
+            if self.total_bytes <= self.max_bytes:
+                break
+
+            self.total_bytes -= cached_file.stat().st_size
+            cached_file.unlink(missing_ok=True)
@@ -0,0 +1,31 @@
+import threading
+from collections import OrderedDict
+
+from result_cache.CacheTier import CacheTier
+
+
+class MemoryCacheTier(CacheTier):
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, list[dict]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> list[dict] | None:
+        with self.lock:
+            if key not in self.entries:
+                return None
+
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def set(self, key: str, segment_boxes: list[dict]):
+        if self.max_entries <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = segment_boxes
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
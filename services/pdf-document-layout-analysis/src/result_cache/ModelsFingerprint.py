@@ -0,0 +1,54 @@
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class ModelsFingerprint:
+    """Hash of the name, size and modification time of model files, part of the result cache keys.
+
+    The files are checked at most once per check_interval seconds, the interval at which replaced models are
+    reloaded, and the hash is only computed again when they changed. With check_interval None, for models
+    loaded once per process, the hash is computed once.
+    """
+
+    def __init__(self, model_paths: list[str | Path], check_interval: float | None = None):
+        self.model_paths = model_paths
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.stats: list[str] = list()
+        self.fingerprint: str | None = None
+        self.checked_at = 0.0
+
+    def get_stats(self) -> list[str]:
+        stats = list()
+        for model_path in self.model_paths:
+            model_stat = os.stat(model_path)
+            stats.append(f"{Path(model_path).name}:{model_stat.st_size}:{model_stat.st_mtime_ns}")
+
+        return stats
+
+    @staticmethod
+    def get_hash(stats: list[str]) -> str:
+        return hashlib.sha256("|".join(stats).encode()).hexdigest()
+
+    def is_checked(self) -> bool:
+        if self.fingerprint is None:
+            return False
+
+        return self.check_interval is None or time.monotonic() - self.checked_at < self.check_interval
+
+    def get(self) -> str:
+        if self.is_checked():
+            return self.fingerprint
+
+        with self.lock:
+            if self.is_checked():
+                return self.fingerprint
+
+            stats = self.get_stats()
+            if stats != self.stats or self.fingerprint is None:
+                self.stats, self.fingerprint = stats, self.get_hash(stats)
+            self.checked_at = time.monotonic()
+            return self.fingerprint
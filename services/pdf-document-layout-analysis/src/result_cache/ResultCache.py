@@ -0,0 +1,59 @@
+import hashlib
+import threading
+
+from result_cache.CacheTier import CacheTier
+
+
+class ResultCache:
+    """Looks up analysis results in each tier in order, copying hits into the faster tiers.
+
+    Keys are content addressed: the PDF bytes, the analysis parameters (including the backends that change the
+    segments) and the fingerprint of the model weights (see ModelsFingerprint), so results computed with other
+    weights are never returned.
+    """
+
+    def __init__(self, tiers: list[CacheTier]):
+        self.tiers = tiers
+        self.lock = threading.Lock()
+        self.hits: dict[str, int] = {tier.name: 0 for tier in tiers}
+        self.misses: int = 0
+
+    @staticmethod
+    def get_key(file_content: bytes, mode: str, models_fingerprint: str, **parameters) -> str:
+        key_hash = hashlib.sha256(file_content)
+        key_parameters = [mode, models_fingerprint]
+        key_parameters += [f"{name}={value}" for name, value in sorted(parameters.items())]
+        key_hash.update("\n".join(key_parameters).encode())
+        return key_hash.hexdigest()
+
+    def get(self, key: str) -> list[dict] | None:
+        for tier_index, tier in enumerate(self.tiers):
+            segment_boxes = tier.get(key)
+            if segment_boxes is None:
+                continue
+
+            for faster_tier in self.tiers[:tier_index]:
+                faster_tier.set(key, segment_boxes)
+            with self.lock:
+                self.hits[tier.name] += 1
+            return segment_boxes
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, segment_boxes: list[dict]):
+        for tier in self.tiers:
+            tier.set(key, segment_boxes)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            hits = dict(self.hits)
+            misses = self.misses
+
+        requests = sum(hits.values()) + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(sum(hits.values()) / requests, 4) if requests else 0.0,
+        }
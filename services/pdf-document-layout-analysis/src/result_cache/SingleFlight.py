@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time; concurrent callers with the same key await its result.
+
+    The computation is shielded, so a caller that goes away does not cancel it for the others. A computation
+    that is not a coroutine, like a streamed analysis, is registered with start and its caller sets the result.
+    """
+
+    def __init__(self):
+        self.flights: dict[str, asyncio.Future] = dict()
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if key not in self.flights:
+            flight = asyncio.ensure_future(compute())
+            self.flights[key] = flight
+            flight.add_done_callback(lambda _: self.remove(key, flight))
+
+        return await asyncio.shield(self.flights[key])
+
+    def start(self, key: str) -> asyncio.Future | None:
+        if key in self.flights:
+            return None
+
+        flight = asyncio.get_running_loop().create_future()
+        self.flights[key] = flight
+        flight.add_done_callback(lambda _: self.remove(key, flight))
+        flight.add_done_callback(lambda _: flight.cancelled() or flight.exception())
+        return flight
+
+    def remove(self, key: str, flight: asyncio.Future):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+
+    async def wait(self, key: str) -> Any | None:
+        if key not in self.flights:
+            return None
+
+        return await asyncio.shield(self.flights[key])
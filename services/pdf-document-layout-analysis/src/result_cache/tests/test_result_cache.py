@@ -0,0 +1,85 @@
+import tempfile
+import time
+from os.path import join
+from pathlib import Path
+from unittest import TestCase
+
+from result_cache.DiskCacheTier import DiskCacheTier
+from result_cache.MemoryCacheTier import MemoryCacheTier
+from result_cache.ModelsFingerprint import ModelsFingerprint
+from result_cache.ResultCache import ResultCache
+
+
+class TestResultCache(TestCase):
+    def test_memory_tier_evicts_least_recently_used(self):
+        memory_tier = MemoryCacheTier(max_entries=2)
+        memory_tier.set("a", [{"page_number": 1}])
+        memory_tier.set("b", [{"page_number": 2}])
+        memory_tier.get("a")
+        memory_tier.set("c", [{"page_number": 3}])
+
+        self.assertEqual([{"page_number": 1}], memory_tier.get("a"))
+        self.assertIsNone(memory_tier.get("b"))
+        self.assertEqual([{"page_number": 3}], memory_tier.get("c"))
+
+    def test_disk_tier_evicts_by_size(self):
+        with tempfile.TemporaryDirectory() as cache_path:
+            disk_tier = DiskCacheTier(cache_path, max_bytes=10**6)
+            disk_tier.set("a", [{"text": "a" * 100}])
+            entry_size = Path(join(cache_path, "a.json.gz")).stat().st_size
+            disk_tier.max_bytes = entry_size * 2
+
+            time.sleep(0.01)
+            disk_tier.set("b", [{"text": "b" * 100}])
+            time.sleep(0.01)
+            disk_tier.get("a")
+            disk_tier.set("c", [{"text": "c" * 100}])
+
+            self.assertEqual([{"text": "a" * 100}], disk_tier.get("a"))
+            self.assertIsNone(disk_tier.get("b"))
+            self.assertEqual([{"text": "c" * 100}], DiskCacheTier(cache_path, entry_size * 2).get("c"))
+
+    def test_hits_are_copied_to_faster_tiers(self):
+        with tempfile.TemporaryDirectory() as cache_path:
+            memory_tier = MemoryCacheTier(max_entries=4)
+            result_cache = ResultCache([memory_tier, DiskCacheTier(cache_path, max_bytes=10**6)])
+            DiskCacheTier(cache_path, max_bytes=10**6).set("key", [{"page_number": 1}])
+
+            self.assertIsNone(result_cache.get("missing"))
+            self.assertEqual([{"page_number": 1}], result_cache.get("key"))
+            self.assertEqual([{"page_number": 1}], memory_tier.get("key"))
+            self.assertEqual({"hits": {"memory": 0, "disk": 1}, "misses": 1, "hit_rate": 0.5}, result_cache.get_stats())
+
+    def test_key_depends_on_content_parameters_and_models_fingerprint(self):
+        key = ResultCache.get_key(b"%PDF", "high_quality", "weights", density=72, pdf_features_backend="poppler")
+
+        self.assertEqual(
+            key, ResultCache.get_key(b"%PDF", "high_quality", "weights", pdf_features_backend="poppler", density=72)
+        )
+        self.assertNotEqual(
+            key, ResultCache.get_key(b"%PDF-", "high_quality", "weights", density=72, pdf_features_backend="poppler")
+        )
+        self.assertNotEqual(
+            key, ResultCache.get_key(b"%PDF", "high_quality", "weights", density=96, pdf_features_backend="poppler")
+        )
+        self.assertNotEqual(
+            key, ResultCache.get_key(b"%PDF", "high_quality", "weights", density=72, pdf_features_backend="pymupdf")
+        )
+        self.assertNotEqual(key, ResultCache.get_key(b"%PDF", "fast", "weights", density=72, pdf_features_backend="poppler"))
+        self.assertNotEqual(
+            key, ResultCache.get_key(b"%PDF", "high_quality", "new weights", density=72, pdf_features_backend="poppler")
+        )
+
+    def test_models_fingerprint_changes_with_the_weights(self):
+        with tempfile.TemporaryDirectory() as models_path:
+            model_path = Path(join(models_path, "model.pth"))
+            model_path.write_bytes(b"weights")
+            checked_fingerprint = ModelsFingerprint([model_path], check_interval=0)
+            loaded_once_fingerprint = ModelsFingerprint([model_path])
+            fingerprint = checked_fingerprint.get()
+            self.assertEqual(fingerprint, loaded_once_fingerprint.get())
+
+            model_path.write_bytes(b"new weights")
+            self.assertNotEqual(fingerprint, checked_fingerprint.get())
+            self.assertEqual(fingerprint, loaded_once_fingerprint.get())
+            self.assertEqual(checked_fingerprint.get(), ModelsFingerprint([model_path], check_interval=3600).get())
@@ -0,0 +1,76 @@
+import asyncio
+from unittest import TestCase
+
+from result_cache.SingleFlight import SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_calls_share_one_computation(self):
+        computations = list()
+
+        async def compute():
+            computations.append(1)
+            await asyncio.sleep(0.01)
+            return [{"page_number": 1}]
+
+        async def run_concurrently():
+            single_flight = SingleFlight()
+            results = await asyncio.gather(*[single_flight.run("key", compute) for _ in range(5)])
+            waiting_after_flight = await single_flight.wait("key")
+            return results, waiting_after_flight, single_flight.flights
+
+        results, waiting_after_flight, flights = asyncio.run(run_concurrently())
+
+        self.assertEqual(1, len(computations))
+        self.assertEqual([[{"page_number": 1}]] * 5, results)
+        self.assertIsNone(waiting_after_flight)
+        self.assertEqual({}, flights)
+
+    def test_exceptions_reach_every_caller(self):
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise ValueError("wrong pdf")
+
+        async def run_concurrently():
+            single_flight = SingleFlight()
+            return await asyncio.gather(*[single_flight.run("key", compute) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run_concurrently())
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_cancelled_caller_does_not_cancel_the_computation(self):
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        async def run_with_cancelled_caller():
+            single_flight = SingleFlight()
+            first_caller = asyncio.ensure_future(single_flight.run("key", compute))
+            await asyncio.sleep(0)
+            second_caller = asyncio.ensure_future(single_flight.wait("key"))
+            first_caller.cancel()
+            return await second_caller
+
+        self.assertEqual("result", asyncio.run(run_with_cancelled_caller()))
+
+    def test_started_flight_is_shared(self):
+        async def compute():
+            return "computed"
+
+        async def run_with_started_flight():
+            single_flight = SingleFlight()
+            flight = single_flight.start("key")
+            second_start = single_flight.start("key")
+            waiting = asyncio.ensure_future(single_flight.wait("key"))
+            running = asyncio.ensure_future(single_flight.run("key", compute))
+            await asyncio.sleep(0)
+            flight.set_result("streamed")
+            return second_start, await waiting, await running, single_flight.flights
+
+        second_start, waiting_result, running_result, flights = asyncio.run(run_with_started_flight())
+
+        self.assertIsNone(second_start)
+        self.assertEqual("streamed", waiting_result)
+        self.assertEqual("streamed", running_result)
+        self.assertEqual({}, flights)
@@ -0,0 +1,81 @@
+import json
+import threading
+from typing import Callable, Iterator
+
+import anyio
+from fastapi.concurrency import run_in_threadpool
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from configuration import service_logger
+
+
+class NdjsonPagesResponse(StreamingResponse):
+    """Streams the segment boxes of the pages produced by a blocking iterator as NDJSON lines.
+
+    The pages are produced in the thread pool, one at a time. An error while producing them is sent as a last
+    {"error": ...} line, so a failed document is not mistaken for a complete one.
+
+    The response is closed exactly once, when the last page is sent, on an error, on a client disconnect or
+    cancellation, and also when the body was never iterated: the pages iterator is closed (after the page
+    being produced, if any, is finished) and on_close receives the segment boxes of all the pages when they
+    were all produced, the exception when producing them failed, or (None, None) when the stream was abandoned.
+    """
+
+    def __init__(
+        self,
+        pages: Iterator[list[dict]],
+        on_close: Callable[[list[dict] | None, Exception | None], None] = lambda segment_boxes, exception: None,
+    ):
+        super().__init__(self.get_lines(), media_type="application/x-ndjson")
+        self.pages = pages
+        self.on_close = on_close
+        self.pages_lock = threading.Lock()
+        self.first_page: list[dict] | None = None
+        self.closed = False
+
+    def get_next_page(self) -> list[dict] | None:
+        with self.pages_lock:
+            return next(self.pages, None)
+
+    def close_pages(self):
+        with self.pages_lock:
+            self.pages.close()
+
+    async def fetch_first_page(self):
+        self.first_page = await run_in_threadpool(self.get_next_page)
+
+    async def get_lines(self):
+        segment_boxes = list()
+        page_segment_boxes = self.first_page
+        try:
+            while page_segment_boxes is not None:
+                segment_boxes.extend(page_segment_boxes)
+                yield "".join(json.dumps(segment_box) + "\n" for segment_box in page_segment_boxes)
+                page_segment_boxes = await run_in_threadpool(self.get_next_page)
+        except Exception as exception:
+            service_logger.error("Error while streaming segments", exc_info=1)
+            await self.close(exception=exception)
+            yield json.dumps({"error": str(exception)}) + "\n"
+            return
+
+        await self.close(segment_boxes)
+
+    async def close(self, segment_boxes: list[dict] | None = None, exception: Exception | None = None):
+        if self.closed:
+            return
+
+        self.closed = True
+        try:
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(self.close_pages)
+        except Exception:
+            service_logger.error("Error while closing the streamed pages", exc_info=1)
+        finally:
+            self.on_close(segment_boxes, exception)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.close()
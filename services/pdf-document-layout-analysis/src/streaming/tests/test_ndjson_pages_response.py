@@ -0,0 +1,100 @@
+import asyncio
+import json
+import threading
+from unittest import TestCase
+
+from starlette.requests import ClientDisconnect
+
+from streaming.NdjsonPagesResponse import NdjsonPagesResponse
+
+SCOPE = {"type": "http", "asgi": {"spec_version": "2.4"}}
+
+
+class Pages:
+    def __init__(self, pages_count: int, error_page: int = -1, release_page: threading.Event | None = None):
+        self.pages_count = pages_count
+        self.error_page = error_page
+        self.release_page = release_page
+        self.closed = False
+
+    def get_pages(self):
+        try:
+            for page_number in range(1, self.pages_count + 1):
+                if page_number == self.error_page:
+                    raise ValueError("wrong page")
+                if page_number > 1 and self.release_page:
+                    self.release_page.wait(timeout=5)
+                yield [{"page_number": page_number}]
+        finally:
+            self.closed = True
+
+
+async def receive():
+    await asyncio.sleep(10)
+
+
+def run_response(pages: Pages, send_fails_after: int = -1):
+    bodies, closes = list(), list()
+
+    async def send(message):
+        if len(bodies) == send_fails_after:
+            raise OSError("client disconnected")
+        bodies.append(message.get("body", b""))
+
+    async def run():
+        response = NdjsonPagesResponse(pages.get_pages(), lambda *close_arguments: closes.append(close_arguments))
+        await response.fetch_first_page()
+        await response(SCOPE, receive, send)
+
+    return bodies, closes, run
+
+
+class TestNdjsonPagesResponse(TestCase):
+    def test_stream_all_pages(self):
+        pages = Pages(3)
+        bodies, closes, run = run_response(pages)
+        asyncio.run(run())
+
+        lines = b"".join(bodies).decode().splitlines()
+        self.assertEqual([{"page_number": page_number} for page_number in [1, 2, 3]], [json.loads(line) for line in lines])
+        self.assertEqual([([{"page_number": 1}, {"page_number": 2}, {"page_number": 3}], None)], closes)
+        self.assertTrue(pages.closed)
+
+    def test_error_is_the_last_line(self):
+        bodies, closes, run = run_response(Pages(3, error_page=2))
+        asyncio.run(run())
+
+        lines = b"".join(bodies).decode().splitlines()
+        self.assertEqual([{"page_number": 1}, {"error": "wrong page"}], [json.loads(line) for line in lines])
+        self.assertEqual(1, len(closes))
+        self.assertIsNone(closes[0][0])
+        self.assertIsInstance(closes[0][1], ValueError)
+
+    def test_client_disconnect_closes_once(self):
+        for send_fails_after in [0, 2]:
+            pages = Pages(3)
+            _, closes, run = run_response(pages, send_fails_after=send_fails_after)
+            with self.assertRaises(ClientDisconnect):
+                asyncio.run(run())
+
+            self.assertEqual([(None, None)], closes)
+            self.assertTrue(pages.closed)
+
+    def test_cancel_while_a_page_is_being_produced(self):
+        release_page = threading.Event()
+        pages = Pages(3, release_page=release_page)
+        bodies, closes, run = run_response(pages)
+
+        async def cancel_during_second_page():
+            streaming = asyncio.ensure_future(run())
+            while len(bodies) < 2:
+                await asyncio.sleep(0.001)
+            streaming.cancel()
+            threading.Timer(0.05, release_page.set).start()
+            with self.assertRaises(asyncio.CancelledError):
+                await streaming
+
+        asyncio.run(cancel_during_second_page())
+
+        self.assertEqual([(None, None)], closes)
+        self.assertTrue(pages.closed)
@@ -1,8 +1,8 @@
 import dataclasses
 import hashlib
-from statistics import mode
 
 from pdf_features.PdfFeatures import PdfFeatures
+from pdf_features.PdfTokensStatistics import PdfTokensStatistics
 
 
 @dataclasses.dataclass
@@ -21,20 +21,12 @@ class Modes:
         self.set_modes()
 
     def set_modes(self):
-        line_spaces, right_spaces, left_spaces = [0], [0], [0]
-        for page, token in self.pdf_features.loop_tokens():
-            right_spaces.append(self.pdf_features.pages[0].page_width - token.bounding_box.right)
-            left_spaces.append(token.bounding_box.left)
-            line_spaces.append(token.bounding_box.bottom)
-
-        self.lines_space_mode = mode(line_spaces)
-        self.left_space_mode = mode(left_spaces)
-        self.right_space_mode = mode(right_spaces)
-
-        font_sizes = [token.font.font_size for page, token in self.pdf_features.loop_tokens() if token.font]
-        self.font_size_mode = mode(font_sizes) if font_sizes else 0
-        font_ids = [token.font.font_id for page, token in self.pdf_features.loop_tokens() if token.font]
-        self.font_family_name_mode = mode(font_ids) if font_ids else ""
+        tokens_statistics = self.pdf_features.tokens_statistics
+        self.lines_space_mode = PdfTokensStatistics.get_mode(tokens_statistics.bottoms)
+        self.left_space_mode = PdfTokensStatistics.get_mode(tokens_statistics.lefts)
+        self.right_space_mode = PdfTokensStatistics.get_mode(tokens_statistics.right_spaces)
+        self.font_size_mode = PdfTokensStatistics.get_mode(tokens_statistics.font_sizes)
+        self.font_family_name_mode = PdfTokensStatistics.get_mode(tokens_statistics.font_ids, "")
         self.font_family_mode = abs(
             int(
                 str(hashlib.sha256(self.font_family_name_mode.encode("utf-8")).hexdigest())[:8],
@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+
+from transformers import PreTrainedTokenizerFast
+
+
+class SubwordsTokenizer:
+    """Splits words into the subword ids and lengths of the VGT word grids, with a fast tokenizer.
+
+    The words of a page are tokenized in one batch, and so are the subwords, without their "#", to get the ids
+    the word grids use (the last id of each subword tokenized alone, or the [CLS] id when nothing is left of it).
+    The results are kept for the last cache_size words, as most words repeat across pages.
+    """
+
+    def __init__(self, tokenizer: PreTrainedTokenizerFast, cache_size: int = 0):
+        self.tokenizer = tokenizer.backend_tokenizer
+        self.cls_token_id = tokenizer.cls_token_id
+        self.cache_size = cache_size
+        self.subwords_by_word: OrderedDict[str, tuple[list[int], list[int]]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def tokenize(self, words: list[str]) -> dict[str, tuple[list[int], list[int]]]:
+        encodings = self.tokenizer.encode_batch(words, add_special_tokens=False)
+        words_subwords = [[token.replace("#", "") for token in encoding.tokens] for encoding in encodings]
+        subwords = list({subword for word_subwords in words_subwords for subword in word_subwords})
+        subwords_encodings = self.tokenizer.encode_batch(subwords, add_special_tokens=False)
+        id_by_subword = {s: e.ids[-1] if e.ids else self.cls_token_id for s, e in zip(subwords, subwords_encodings)}
+        return {
+            word: ([id_by_subword[subword] for subword in word_subwords], [len(subword) for subword in word_subwords])
+            for word, word_subwords in zip(words, words_subwords)
+        }
+
+    def get_subwords(self, words: list[str]) -> list[tuple[list[int], list[int]]]:
+        with self.lock:
+            subwords_by_word = {word: self.subwords_by_word[word] for word in words if word in self.subwords_by_word}
+            for word in subwords_by_word:
+                self.subwords_by_word.move_to_end(word)
+
+        new_words = list(dict.fromkeys(word for word in words if word not in subwords_by_word))
+        if new_words:
+            new_subwords_by_word = self.tokenize(new_words)
+            subwords_by_word.update(new_subwords_by_word)
+            with self.lock:
+                self.subwords_by_word.update(new_subwords_by_word)
+                while len(self.subwords_by_word) > self.cache_size:
+                    self.subwords_by_word.popitem(last=False)
+
+        return [subwords_by_word[word] for word in words]
@@ -0,0 +1,92 @@
+from collections import deque
+from concurrent.futures import Future
+from typing import Iterator
+
+import numpy as np
+import torch
+from detectron2.data import transforms as T
+from detectron2.structures import BoxMode
+
+from batching.MicroBatcher import MicroBatcher
+from configuration import DOCLAYNET_TYPE_BY_ID
+from data_model.PdfImages import PdfImages
+from data_model.Prediction import Prediction
+from ditod.dataset_mapper import build_transform_gen, transform_subwords_boxes
+from pdf_features.PdfPage import PdfPage
+from pdf_features.Rectangle import Rectangle
+from vgt.create_word_grid import get_grid_words_dict
+
+
+class VGTPredictor:
+    """Runs VGT.inference on in-memory page images and word grids.
+
+    It applies the same test transforms as DetrDatasetMapper and converts the model output to the
+    Prediction objects that used to be read back from coco_instances_results.json. Pages from concurrent
+    requests are grouped by a MicroBatcher, so each forward pass can serve several documents.
+    """
+
+    def __init__(self, model, configuration, max_batch_size: int = 1, batch_wait_time: float = 0):
+        self.model = model
+        self.model.eval()
+        self.transform_gens = build_transform_gen(configuration, is_train=False)
+        self.image_format = configuration.INPUT.FORMAT
+        self.category_ids = sorted(DOCLAYNET_TYPE_BY_ID.keys())
+        self.max_batch_size = max_batch_size
+        self.batcher = MicroBatcher(self.predict_batch, max_batch_size, batch_wait_time, name="vgt_batcher")
+
+    def get_model_input(self, image: np.ndarray, grid_words_dict: dict) -> dict:
+        original_image = image[:, :, ::-1] if self.image_format == "BGR" else image
+        height, width = original_image.shape[:2]
+        resized_image, transforms = T.apply_transform_gens(self.transform_gens, original_image)
+        image_shape = resized_image.shape[:2]
+
+        bbox = transform_subwords_boxes(grid_words_dict["bbox_subword_list"], transforms, image_shape)
+        return {
+            "image": torch.as_tensor(np.ascontiguousarray(resized_image.transpose(2, 0, 1))),
+            "height": height,
+            "width": width,
+            "input_ids": grid_words_dict["input_ids"],
+            "bbox": bbox,
+        }
+
+    def get_predictions(self, model_output: dict) -> list[Prediction]:
+        instances = model_output["instances"].to("cpu")
+        boxes = BoxMode.convert(instances.pred_boxes.tensor.numpy(), BoxMode.XYXY_ABS, BoxMode.XYWH_ABS).tolist()
+        scores = instances.scores.tolist()
+        classes = instances.pred_classes.tolist()
+
+        predictions = list()
+        for box, score, class_index in zip(boxes, scores, classes):
+            bounding_box = Rectangle.from_width_height(
+                left=int(box[0]), top=int(box[1]), width=int(box[2]), height=int(box[3])
+            )
+            category_id = self.category_ids[class_index]
+            predictions.append(Prediction(bounding_box=bounding_box, category_id=category_id, score=round(score * 100, 2)))
+
+        return predictions
+
+    def predict_batch(self, model_inputs: list[dict]) -> list[list[Prediction]]:
+        with torch.no_grad():
+            model_outputs = self.model(model_inputs)
+        return [self.get_predictions(model_output) for model_output in model_outputs]
+
+    def predict_pages(self, pdf_images: PdfImages) -> Iterator[tuple[PdfPage, list[Prediction]]]:
+        pages_futures: deque[tuple[PdfPage, Future]] = deque()
+        for page, image in zip(pdf_images.pdf_features.pages, pdf_images.pdf_images):
+            model_input = self.get_model_input(image, get_grid_words_dict(page.tokens))
+            pages_futures.append((page, self.batcher.submit(model_input)))
+            if len(pages_futures) >= self.max_batch_size:
+                ready_page, ready_future = pages_futures.popleft()
+                yield ready_page, ready_future.result()
+
+        for page, future in pages_futures:
+            yield page, future.result()
+
+    def predict(self, pdf_images_list: list[PdfImages]) -> dict[str, list[Prediction]]:
+        vgt_predictions_dict: dict[str, list[Prediction]] = dict()
+        for pdf_images in pdf_images_list:
+            for page, predictions in self.predict_pages(pdf_images):
+                if predictions:
+                    vgt_predictions_dict[f"{pdf_images.pdf_features.file_name}_{page.page_number - 1}"] = predictions
+
+        return vgt_predictions_dict
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b"WORDGRID"
+
+
+class WordGridsFile:
+    """The word grids of all the pages of a document in one file, read through a memory map.
+
+    The file holds the MAGIC bytes, the pages count, the offsets table (pages count + 1 int64, the index of
+    the first subword of each page and the subwords count at the end), the input ids of all the pages (int64)
+    and their subword boxes (float64, left, top, width and height). Only the parts of a page that are used are
+    read from disk.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = path
+        self.memmap = np.memmap(path, dtype=np.uint8, mode="r")
+        if self.memmap[: len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError(f"Not a word grids file: {path}")
+
+        pages_count = int(self.memmap[len(MAGIC) : len(MAGIC) + 8].view(np.int64)[0])
+        offsets_start = len(MAGIC) + 8
+        input_ids_start = offsets_start + 8 * (pages_count + 1)
+        self.offsets = self.memmap[offsets_start:input_ids_start].view(np.int64)
+        subwords_count = int(self.offsets[-1])
+        boxes_start = input_ids_start + 8 * subwords_count
+        self.input_ids = self.memmap[input_ids_start:boxes_start].view(np.int64)
+        self.bbox_subword_list = self.memmap[boxes_start : boxes_start + 32 * subwords_count].view(np.float64).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get_page(self, page_index: int) -> dict:
+        start, end = self.offsets[page_index], self.offsets[page_index + 1]
+        return {"input_ids": self.input_ids[start:end], "bbox_subword_list": self.bbox_subword_list[start:end]}
+
+    @staticmethod
+    def write(path: str | Path, grid_words_dicts: list[dict]):
+        input_ids = [np.asarray(grid_words_dict["input_ids"], dtype=np.int64) for grid_words_dict in grid_words_dicts]
+        boxes = [np.asarray(d["bbox_subword_list"], dtype=np.float64).reshape(-1, 4) for d in grid_words_dicts]
+        offsets = np.concatenate([[0], np.cumsum([len(page_input_ids) for page_input_ids in input_ids])])
+
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, mode="wb") as file:
+            file.write(MAGIC)
+            file.write(np.int64(len(grid_words_dicts)).tobytes())
+            file.write(offsets.astype(np.int64).tobytes())
+            file.write(np.concatenate([np.zeros(0, dtype=np.int64)] + input_ids).tobytes())
+            file.write(np.concatenate([np.zeros((0, 4))] + boxes).tobytes())
+
+        os.replace(temporary_path, path)
@@ -1,97 +1,159 @@
-import pickle
 import shutil
 
 import numpy as np
 from os import makedirs
-from os.path import join, exists
+from os.path import exists
+from pathlib import Path
 from pdf_features.PdfToken import PdfToken
 from pdf_features.Rectangle import Rectangle
 from pdf_features.PdfFeatures import PdfFeatures
 
-from bros.tokenization_bros import BrosTokenizer
-from configuration import WORD_GRIDS_PATH
-
-tokenizer = BrosTokenizer.from_pretrained("naver-clova-ocr/bros-base-uncased")
-
-
-def rectangle_to_bbox(rectangle: Rectangle):
-    return [rectangle.left, rectangle.top, rectangle.width, rectangle.height]
-
-
-def get_words_positions(text: str, rectangle: Rectangle):
-    text = text.strip()
-    text_len = len(text)
-
-    width_per_letter = rectangle.width / text_len
-
-    words_bboxes = [Rectangle(rectangle.left, rectangle.top, rectangle.left + 5, rectangle.bottom)]
-    words_bboxes[-1].width = 0
-    words_bboxes[-1].right = words_bboxes[-1].left
-
-    for letter in text:
-        if letter == " ":
-            left = words_bboxes[-1].right + width_per_letter
-            words_bboxes.append(Rectangle(left, words_bboxes[-1].top, left + 5, words_bboxes[-1].bottom))
-            words_bboxes[-1].width = 0
-            words_bboxes[-1].right = words_bboxes[-1].left
-        else:
-            words_bboxes[-1].right = words_bboxes[-1].right + width_per_letter
-            words_bboxes[-1].width = words_bboxes[-1].width + width_per_letter
-
-    words = text.split()
-    return words, words_bboxes
+from transformers.convert_slow_tokenizer import BertConverter
 
-
-def get_subwords_positions(word: str, rectangle: Rectangle):
-    width_per_letter = rectangle.width / len(word)
-    word_tokens = [x.replace("#", "") for x in tokenizer.tokenize(word)]
-
-    if not word_tokens:
-        return [], []
-
-    ids = [x[-2] for x in tokenizer(word_tokens)["input_ids"]]
-
-    right = rectangle.left + len(word_tokens[0]) * width_per_letter
-    bboxes = [Rectangle(rectangle.left, rectangle.top, right, rectangle.bottom)]
-
-    for subword in word_tokens[1:]:
-        right = bboxes[-1].right + len(subword) * width_per_letter
-        bboxes.append(Rectangle(bboxes[-1].right, rectangle.top, right, rectangle.bottom))
-
-    return ids, bboxes
+from bros.tokenization_bros import BrosTokenizer
+from bros.tokenization_bros_fast import BrosTokenizerFast
+from configuration import WORD_GRIDS_PATH, WORD_GRID_SUBWORDS_CACHE_SIZE
+from vgt.SubwordsTokenizer import SubwordsTokenizer
+from vgt.WordGridsFile import WordGridsFile
+
+slow_tokenizer = BrosTokenizer.from_pretrained("naver-clova-ocr/bros-base-uncased")
+tokenizer = BrosTokenizerFast(tokenizer_object=BertConverter(slow_tokenizer).converted())
+subwords_tokenizer = SubwordsTokenizer(tokenizer, WORD_GRID_SUBWORDS_CACHE_SIZE)
+
+
+def get_words_boxes(tokens: list[PdfToken]):
+    """Left, width and token index of the boxes each token text is split into, one box per space separated part.
+
+    Every character moves the box right by the width per letter of its token, and the width of a box is the
+    width per letter times its characters count. Only flat arrays, one item per character or per box, are
+    allocated, so a very long token does not pad the arrays of every other token of the page.
+    """
+    texts = [token.content.strip() for token in tokens]
+    texts_lengths = np.array([len(text) for text in texts])
+    lefts = np.array([token.bounding_box.left for token in tokens], dtype=np.float64)
+    widths_per_letter = np.array([token.bounding_box.width for token in tokens]) / texts_lengths
+
+    characters = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    spaces = np.flatnonzero(characters == ord(" "))
+    texts_starts = np.cumsum(texts_lengths) - texts_lengths
+    boxes_starts = np.sort(np.concatenate([texts_starts, spaces + 1]))
+    boxes_ends = np.sort(np.concatenate([texts_starts + texts_lengths, spaces]))
+    boxes_tokens_indexes = np.searchsorted(texts_starts, boxes_starts, side="right") - 1
+    boxes_widths_per_letter = widths_per_letter[boxes_tokens_indexes]
+    boxes_columns = boxes_starts - texts_starts[boxes_tokens_indexes]
+    boxes_lefts = lefts[boxes_tokens_indexes] + boxes_columns * boxes_widths_per_letter
+    boxes_widths = (boxes_ends - boxes_starts) * boxes_widths_per_letter
+    return boxes_lefts, boxes_widths, boxes_tokens_indexes
+
+
+def get_word_subwords_boxes(left: float, width_per_letter: float, top: int, bottom: int, subwords_lengths: list[int]):
+    right = left + subwords_lengths[0] * width_per_letter
+    rectangles = [Rectangle(left, top, right, bottom)]
+    for subword_length in subwords_lengths[1:]:
+        right = rectangles[-1].right + subword_length * width_per_letter
+        rectangles.append(Rectangle(rectangles[-1].right, top, right, bottom))
+
+    return [(rectangle.left, rectangle.width) for rectangle in rectangles]
+
+
+def get_subwords_boxes(lefts: np.ndarray, widths_per_letter: np.ndarray, tops, bottoms, subwords_lengths: list[list[int]]):
+    """Left and width of the subwords boxes, laid one after the other from the left of their word.
+
+    The letters before each subword are counted with a cumulative sum over the flat subwords lengths, restarted
+    at every word. Words with an empty subword box are laid out with Rectangle, that widens empty boxes by one
+    on each side.
+    """
+    subwords_counts = np.array([len(lengths) for lengths in subwords_lengths])
+    flat_lengths = np.concatenate([np.asarray(lengths, dtype=np.int64) for lengths in subwords_lengths])
+    subwords_words_indexes = np.repeat(np.arange(len(subwords_lengths)), subwords_counts)
+    letters_ends = np.cumsum(flat_lengths)
+    words_letters_starts = (letters_ends - flat_lengths)[np.cumsum(subwords_counts) - subwords_counts]
+    letters_before = letters_ends - flat_lengths - words_letters_starts[subwords_words_indexes]
+
+    subwords_lefts = lefts[subwords_words_indexes] + letters_before * widths_per_letter[subwords_words_indexes]
+    subwords_rights = (
+        lefts[subwords_words_indexes] + (letters_before + flat_lengths) * widths_per_letter[subwords_words_indexes]
+    )
+    boxes = np.column_stack([subwords_lefts, subwords_rights - subwords_lefts])
+
+    boxes_starts = np.cumsum(subwords_counts) - subwords_counts
+    for word_index in np.unique(subwords_words_indexes[boxes[:, 1] == 0]):
+        word_lengths = subwords_lengths[word_index]
+        word_boxes = get_word_subwords_boxes(
+            lefts[word_index], widths_per_letter[word_index], tops[word_index], bottoms[word_index], word_lengths
+        )
+        boxes[boxes_starts[word_index] : boxes_starts[word_index] + len(word_lengths)] = word_boxes
+
+    return boxes
 
 
 def get_grid_words_dict(tokens: list[PdfToken]):
-    texts, bbox_texts_list, inputs_ids, bbox_subword_list = [], [], [], []
-    for token in tokens:
-        words, words_bboxes = get_words_positions(token.content, token.bounding_box)
-        texts += words
-        bbox_texts_list += [rectangle_to_bbox(r) for r in words_bboxes]
-        for word, word_box in zip(words, words_bboxes):
-            ids, subwords_bboxes = get_subwords_positions(word, word_box)
-            inputs_ids += ids
-            bbox_subword_list += [rectangle_to_bbox(r) for r in subwords_bboxes]
+    if not tokens:
+        return {"input_ids": np.array([]), "bbox_subword_list": np.array([]), "texts": [], "bbox_texts_list": np.array([])}
+
+    boxes_lefts, boxes_widths, boxes_tokens_indexes = get_words_boxes(tokens)
+    tops = np.array([token.bounding_box.top for token in tokens])
+    heights = np.array([token.bounding_box.height for token in tokens])
+    boxes_tops, boxes_heights = tops[boxes_tokens_indexes], heights[boxes_tokens_indexes]
+
+    texts, words, words_boxes_indexes = [], [], []
+    tokens_boxes_starts = np.searchsorted(boxes_tokens_indexes, np.arange(len(tokens))).tolist()
+    for token, token_boxes_start in zip(tokens, tokens_boxes_starts):
+        text = token.content.strip()
+        texts += text.split()
+        for box_index, word in enumerate(text.split()[: text.count(" ") + 1], start=token_boxes_start):
+            words.append(word)
+            words_boxes_indexes.append(box_index)
+
+    words_subwords = subwords_tokenizer.get_subwords(words)
+    subwords_boxes_indexes = [box_index for box_index, (ids, _) in zip(words_boxes_indexes, words_subwords) if ids]
+    subwords_words = [word for word, (ids, _) in zip(words, words_subwords) if ids]
+    subwords_lengths = [lengths for ids, lengths in words_subwords if ids]
+    inputs_ids = [subword_id for ids, _ in words_subwords for subword_id in ids]
+
+    bbox_subword_list = np.array([])
+    if subwords_lengths:
+        lefts, widths = boxes_lefts[subwords_boxes_indexes], boxes_widths[subwords_boxes_indexes]
+        widths_per_letter = widths / np.array([len(word) for word in subwords_words])
+        subwords_tokens_indexes = boxes_tokens_indexes[subwords_boxes_indexes]
+        subwords_tops, subwords_heights = tops[subwords_tokens_indexes], heights[subwords_tokens_indexes]
+        bottoms = subwords_tops + subwords_heights
+        subwords_boxes = get_subwords_boxes(lefts, widths_per_letter, subwords_tops, bottoms, subwords_lengths)
+        subwords_counts = [len(lengths) for lengths in subwords_lengths]
+        bbox_subword_list = np.column_stack(
+            [
+                subwords_boxes[:, 0],
+                np.repeat(subwords_tops, subwords_counts),
+                subwords_boxes[:, 1],
+                np.repeat(subwords_heights, subwords_counts),
+            ]
+        )
 
     return {
         "input_ids": np.array(inputs_ids),
-        "bbox_subword_list": np.array(bbox_subword_list),
+        "bbox_subword_list": bbox_subword_list,
         "texts": texts,
-        "bbox_texts_list": np.array(bbox_texts_list),
+        "bbox_texts_list": np.column_stack([boxes_lefts, boxes_tops, boxes_widths, boxes_heights]),
     }
 
 
-def create_word_grid(pdf_features_list: list[PdfFeatures]):
-    makedirs(WORD_GRIDS_PATH, exist_ok=True)
+def get_word_grid_path(word_grids_path: str | Path, pdf_name: str) -> Path:
+    return Path(word_grids_path, f"{pdf_name}.word_grids")
+
+
+def create_word_grid(pdf_features_list: list[PdfFeatures], word_grids_path: str | Path = WORD_GRIDS_PATH):
+    makedirs(word_grids_path, exist_ok=True)
 
     for pdf_features in pdf_features_list:
+        word_grid_path = get_word_grid_path(word_grids_path, pdf_features.file_name)
+        if exists(word_grid_path):
+            continue
+        pages_count = max([page.page_number for page in pdf_features.pages], default=0)
+        grid_words_dicts = [{"input_ids": [], "bbox_subword_list": []} for _ in range(pages_count)]
         for page in pdf_features.pages:
-            image_id = f"{pdf_features.file_name}_{page.page_number - 1}"
-            if exists(join(WORD_GRIDS_PATH, image_id + ".pkl")):
-                continue
-            grid_words_dict = get_grid_words_dict(page.tokens)
-            with open(join(WORD_GRIDS_PATH, f"{image_id}.pkl"), mode="wb") as file:
-                pickle.dump(grid_words_dict, file)
+            grid_words_dicts[page.page_number - 1] = get_grid_words_dict(page.tokens)
+        WordGridsFile.write(word_grid_path, grid_words_dicts)
 
 
-def remove_word_grids():
-    shutil.rmtree(WORD_GRIDS_PATH, ignore_errors=True)
+def remove_word_grids(word_grids_path: str | Path = WORD_GRIDS_PATH):
+    shutil.rmtree(word_grids_path, ignore_errors=True)
@@ -1,12 +1,13 @@
 import json
 from os import makedirs
+from pathlib import Path
 from pdf_features.PdfToken import PdfToken
 from data_model.PdfImages import PdfImages
 from configuration import DOCLAYNET_TYPE_BY_ID
-from configuration import JSONS_ROOT_PATH, JSON_TEST_FILE_PATH
+from configuration import JSON_TEST_FILE_PATH
 
 
-def save_annotations_json(annotations: list, width_height: list, images: list):
+def save_annotations_json(annotations: list, width_height: list, images: list, json_file_path: Path):
     images_dict = [
         {
             "id": i,
@@ -21,7 +22,7 @@ def save_annotations_json(annotations: list, width_height: list, images: list):
 
     coco_dict = {"images": images_dict, "categories": categories_dict, "annotations": annotations}
 
-    JSON_TEST_FILE_PATH.write_text(json.dumps(coco_dict))
+    json_file_path.write_text(json.dumps(coco_dict))
 
 
 def get_annotation(index: int, image_id: str, token: PdfToken):
@@ -40,15 +41,16 @@ def get_annotations_for_document(annotations, images, index, pdf_images, width_h
     for page_index, page in enumerate(pdf_images.pdf_features.pages):
         image_id = f"{pdf_images.pdf_features.file_name}_{page.page_number - 1}"
         images.append(image_id)
-        width_height.append((pdf_images.pdf_images[page_index].width, pdf_images.pdf_images[page_index].height))
+        image_height, image_width = pdf_images.pdf_images[page_index].shape[:2]
+        width_height.append((image_width, image_height))
 
         for token in page.tokens:
             annotations.append(get_annotation(index, image_id, token))
             index += 1
 
 
-def get_annotations(pdf_images_list: list[PdfImages]):
-    makedirs(JSONS_ROOT_PATH, exist_ok=True)
+def get_annotations(pdf_images_list: list[PdfImages], json_file_path: Path = JSON_TEST_FILE_PATH):
+    makedirs(json_file_path.parent, exist_ok=True)
 
     annotations = list()
     images = list()
@@ -59,4 +61,4 @@ def get_annotations(pdf_images_list: list[PdfImages]):
         get_annotations_for_document(annotations, images, index, pdf_images, width_height)
         index += sum([len(page.tokens) for page in pdf_images.pdf_features.pages])
 
-    save_annotations_json(annotations, width_height, images)
+    save_annotations_json(annotations, width_height, images, json_file_path)
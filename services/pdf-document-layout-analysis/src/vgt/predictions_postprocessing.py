@@ -0,0 +1,104 @@
+from statistics import mode
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from data_model.Prediction import Prediction
+from pdf_features.Rectangle import Rectangle
+
+
+def get_boxes(rectangles: list[Rectangle]) -> np.ndarray:
+    boxes = [(rectangle.left, rectangle.top, rectangle.right, rectangle.bottom) for rectangle in rectangles]
+    return np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def get_intersecting(boxes_1: np.ndarray, boxes_2: np.ndarray) -> np.ndarray:
+    lefts = np.maximum(boxes_1[:, None, 0], boxes_2[None, :, 0])
+    tops = np.maximum(boxes_1[:, None, 1], boxes_2[None, :, 1])
+    rights = np.minimum(boxes_1[:, None, 2], boxes_2[None, :, 2])
+    bottoms = np.minimum(boxes_1[:, None, 3], boxes_2[None, :, 3])
+    return (lefts < rights) & (tops < bottoms)
+
+
+def get_intersection_percentages(boxes_1: np.ndarray, boxes_2: np.ndarray) -> np.ndarray:
+    widths = np.minimum(boxes_1[:, None, 2], boxes_2[None, :, 2]) - np.maximum(boxes_1[:, None, 0], boxes_2[None, :, 0])
+    heights = np.minimum(boxes_1[:, None, 3], boxes_2[None, :, 3]) - np.maximum(boxes_1[:, None, 1], boxes_2[None, :, 1])
+    areas_1 = (boxes_1[:, 2] - boxes_1[:, 0]) * (boxes_1[:, 3] - boxes_1[:, 1])
+    intersecting = (widths > 0) & (heights > 0)
+    return np.divide(100 * widths * heights, areas_1[:, None], out=np.zeros(intersecting.shape), where=intersecting)
+
+
+def get_colliding_groups(boxes: np.ndarray) -> list[list[int]]:
+    groups = [[index] for index in range(len(boxes))]
+    while len(groups) > 1:
+        groups_boxes = np.array([[*boxes[group, :2].min(axis=0), *boxes[group, 2:].max(axis=0)] for group in groups])
+        intersecting = get_intersecting(groups_boxes, groups_boxes)
+        np.fill_diagonal(intersecting, False)
+        if not intersecting.any():
+            break
+
+        _, labels = connected_components(csr_matrix(intersecting), directed=False)
+        merged_groups: dict[int, list[int]] = dict()
+        for group, label in zip(groups, labels):
+            merged_groups.setdefault(label, list()).extend(group)
+        groups = sorted(sorted(group) for group in merged_groups.values())
+
+    return groups
+
+
+def get_merged_prediction_type(to_merge: list[Prediction]):
+    table_exists = any([p.category_id == 9 for p in to_merge])
+    if not table_exists:
+        return mode([p.category_id for p in sorted(to_merge, key=lambda x: -x.score)])
+    return 9
+
+
+def merge_predictions_group(predictions: list[Prediction]):
+    while True:
+        new_predictions, merged = [], False
+        while predictions:
+            p1 = predictions.pop(0)
+            to_merge = [p for p in predictions if p1.bounding_box.get_intersection_percentage(p.bounding_box) > 0]
+            for prediction in to_merge:
+                predictions.remove(prediction)
+            if to_merge:
+                to_merge.append(p1)
+                p1.bounding_box = Rectangle.merge_rectangles([prediction.bounding_box for prediction in to_merge])
+                p1.category_id = get_merged_prediction_type(to_merge)
+                merged = True
+            new_predictions.append(p1)
+        if not merged:
+            return new_predictions
+        predictions = new_predictions
+
+
+def merge_colliding_predictions(predictions: list[Prediction]) -> list[Prediction]:
+    """Merges the predictions whose boxes collide, directly or through the boxes they are merged into.
+
+    The groups that end up merged are found first with the boxes of the whole page. Boxes of different groups
+    never collide, so running the pairwise merge on each group alone gives the same predictions, in the same
+    order, as running it on the page.
+    """
+    predictions = [p for p in predictions if not p.score < 20]
+    merged_predictions = list()
+    for group in get_colliding_groups(get_boxes([prediction.bounding_box for prediction in predictions])):
+        merged_predictions.extend(merge_predictions_group([predictions[index] for index in group]))
+
+    return merged_predictions
+
+
+def get_best_predictions_indexes(tokens_boxes: np.ndarray, predictions_boxes: np.ndarray, scores: np.ndarray):
+    """Index of the prediction each token belongs to, or -1 when no prediction intersects it.
+
+    Among the intersecting predictions with a positive score, it is the first one with a score of at least 99,
+    or else the first one with the highest score.
+    """
+    if not len(predictions_boxes):
+        return np.full(len(tokens_boxes), -1)
+
+    candidates = get_intersecting(tokens_boxes, predictions_boxes) & (scores > 0)
+    candidates_scores = np.where(candidates, scores, -np.inf)
+    confident = candidates_scores >= 99
+    best_indexes = np.where(confident.any(axis=1), np.argmax(confident, axis=1), np.argmax(candidates_scores, axis=1))
+    return np.where(candidates.any(axis=1), best_indexes, -1)
@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from configuration import RASTERIZATION_WORKERS
+
+
+def get_page_ranges(pages_count: int, shards_count: int) -> list[tuple[int, int]]:
+    shards_count = max(1, min(shards_count, pages_count))
+    pages_per_shard, remaining_pages = divmod(pages_count, shards_count)
+    page_ranges = list()
+    first_page = 1
+    for shard_index in range(shards_count):
+        last_page = first_page + pages_per_shard - 1 + (1 if shard_index < remaining_pages else 0)
+        page_ranges.append((first_page, last_page))
+        first_page = last_page + 1
+
+    return page_ranges
+
+
+def rasterize_page_range(pdf_path: str | Path, density: int, first_page: int, last_page: int) -> list[np.ndarray]:
+    images = convert_from_path(pdf_path, dpi=density, first_page=first_page, last_page=last_page, fmt="ppm")
+    return [np.asarray(image) for image in images]
+
+
+def rasterize_pdf(pdf_path: str | Path, density: int = 72, workers: int = RASTERIZATION_WORKERS) -> list[np.ndarray]:
+    pages_count = pdfinfo_from_path(pdf_path)["Pages"]
+    if not pages_count:
+        return list()
+
+    page_ranges = get_page_ranges(pages_count, workers)
+    if len(page_ranges) == 1:
+        return rasterize_page_range(pdf_path, density, *page_ranges[0])
+
+    with ThreadPoolExecutor(max_workers=len(page_ranges)) as executor:
+        shards = executor.map(lambda page_range: rasterize_page_range(pdf_path, density, *page_range), page_ranges)
+        return [image for shard in shards for image in shard]
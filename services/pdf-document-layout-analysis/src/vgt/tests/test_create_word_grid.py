@@ -0,0 +1,116 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from bros.tokenization_bros import BrosTokenizer
+from pdf_features.PdfFont import PdfFont
+from pdf_features.PdfToken import PdfToken
+from pdf_features.Rectangle import Rectangle
+from pdf_token_type_labels.TokenType import TokenType
+from vgt.create_word_grid import get_grid_words_dict, subwords_tokenizer
+
+slow_tokenizer = BrosTokenizer.from_pretrained("naver-clova-ocr/bros-base-uncased")
+WORDS = ["the", "document", "layout", "analysis", "Tables", "2024", "#1", "##", "e-mail", "café", "中文", "x", "(a)"]
+
+
+def get_random_tokens(tokens_count: int) -> list[PdfToken]:
+    font = PdfFont("font", False, False, 10.0, "#000000")
+    tokens = list()
+    for token_index in range(tokens_count):
+        separators = random.choices([" ", "  ", "\t", ", "], weights=[20, 2, 1, 2], k=random.randint(1, 8))
+        content = random.choice(WORDS) + "".join(separator + random.choice(WORDS) for separator in separators)
+        left, top = random.randint(0, 550), random.randint(0, 800)
+        bounding_box = Rectangle.from_width_height(left, top, random.randint(1, 300), random.randint(1, 12))
+        tokens.append(PdfToken(1, "tag", f" {content} ", font, token_index, bounding_box, TokenType.TEXT))
+
+    return tokens
+
+
+def rectangle_to_bbox(rectangle: Rectangle):
+    return [rectangle.left, rectangle.top, rectangle.width, rectangle.height]
+
+
+def get_words_positions_scanning(text: str, rectangle: Rectangle):
+    text = text.strip()
+    width_per_letter = rectangle.width / len(text)
+    words_bboxes = [Rectangle(rectangle.left, rectangle.top, rectangle.left + 5, rectangle.bottom)]
+    words_bboxes[-1].width = 0
+    words_bboxes[-1].right = words_bboxes[-1].left
+    for letter in text:
+        if letter == " ":
+            left = words_bboxes[-1].right + width_per_letter
+            words_bboxes.append(Rectangle(left, words_bboxes[-1].top, left + 5, words_bboxes[-1].bottom))
+            words_bboxes[-1].width = 0
+            words_bboxes[-1].right = words_bboxes[-1].left
+        else:
+            words_bboxes[-1].right = words_bboxes[-1].right + width_per_letter
+            words_bboxes[-1].width = words_bboxes[-1].width + width_per_letter
+
+    return text.split(), words_bboxes
+
+
+def get_subwords_positions_scanning(word: str, rectangle: Rectangle):
+    width_per_letter = rectangle.width / len(word)
+    word_tokens = [x.replace("#", "") for x in slow_tokenizer.tokenize(word)]
+    if not word_tokens:
+        return [], []
+
+    ids = [x[-2] for x in slow_tokenizer(word_tokens)["input_ids"]]
+    right = rectangle.left + len(word_tokens[0]) * width_per_letter
+    bboxes = [Rectangle(rectangle.left, rectangle.top, right, rectangle.bottom)]
+    for subword in word_tokens[1:]:
+        right = bboxes[-1].right + len(subword) * width_per_letter
+        bboxes.append(Rectangle(bboxes[-1].right, rectangle.top, right, rectangle.bottom))
+
+    return ids, bboxes
+
+
+def get_grid_words_dict_scanning(tokens: list[PdfToken]):
+    texts, bbox_texts_list, inputs_ids, bbox_subword_list = [], [], [], []
+    for token in tokens:
+        words, words_bboxes = get_words_positions_scanning(token.content, token.bounding_box)
+        texts += words
+        bbox_texts_list += [rectangle_to_bbox(r) for r in words_bboxes]
+        for word, word_box in zip(words, words_bboxes):
+            ids, subwords_bboxes = get_subwords_positions_scanning(word, word_box)
+            inputs_ids += ids
+            bbox_subword_list += [rectangle_to_bbox(r) for r in subwords_bboxes]
+
+    return {
+        "input_ids": np.array(inputs_ids),
+        "bbox_subword_list": np.array(bbox_subword_list),
+        "texts": texts,
+        "bbox_texts_list": np.array(bbox_texts_list),
+    }
+
+
+class TestCreateWordGrid(TestCase):
+    def test_same_grid_as_scanning(self):
+        random.seed(0)
+        for tokens_count in [0, 1, 5, 200]:
+            tokens = get_random_tokens(tokens_count)
+            expected = get_grid_words_dict_scanning(tokens)
+            grid_words_dict = get_grid_words_dict(tokens)
+            self.assertEqual(expected["texts"], grid_words_dict["texts"])
+            for key in ["input_ids", "bbox_subword_list", "bbox_texts_list"]:
+                self.assertEqual(expected[key].shape, grid_words_dict[key].shape)
+                self.assertTrue(np.allclose(expected[key], grid_words_dict[key], rtol=0, atol=1e-9))
+
+    def test_long_token_does_not_pad_the_page(self):
+        random.seed(1)
+        tokens = get_random_tokens(50)
+        font = PdfFont("font", False, False, 10.0, "#000000")
+        long_content = "A" * 30000 + " layout " + "b" * 20000
+        tokens.append(PdfToken(1, "tag", long_content, font, 50, Rectangle.from_width_height(0, 0, 500, 10), TokenType.TEXT))
+        expected = get_grid_words_dict_scanning(tokens)
+        grid_words_dict = get_grid_words_dict(tokens)
+        self.assertEqual(expected["texts"], grid_words_dict["texts"])
+        for key in ["input_ids", "bbox_subword_list", "bbox_texts_list"]:
+            self.assertTrue(np.allclose(expected[key], grid_words_dict[key], rtol=0, atol=1e-9))
+
+    def test_subwords_cache(self):
+        subwords = subwords_tokenizer.get_subwords(["layout", "analysis", "layout"])
+        self.assertEqual(subwords[0], subwords[2])
+        self.assertIn("layout", subwords_tokenizer.subwords_by_word)
+        self.assertLessEqual(len(subwords_tokenizer.subwords_by_word), subwords_tokenizer.cache_size)
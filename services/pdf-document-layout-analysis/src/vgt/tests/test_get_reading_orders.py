@@ -0,0 +1,117 @@
+import random
+from unittest import TestCase
+
+from fast_trainer.PdfSegment import PdfSegment
+from pdf_features.PdfFont import PdfFont
+from pdf_features.PdfPage import PdfPage
+from pdf_features.PdfToken import PdfToken
+from pdf_features.Rectangle import Rectangle
+from pdf_token_type_labels.TokenType import TokenType
+from vgt.get_reading_orders import add_no_token_segments, get_ordered_segments_for_page
+
+
+def get_random_page(tokens_count: int, segments_count: int) -> tuple[PdfPage, list[PdfSegment]]:
+    font = PdfFont("font", False, False, 10.0, "#000000")
+    tokens = list()
+    for token_index in range(tokens_count):
+        left, top = random.randint(0, 550), random.randint(0, 800)
+        bounding_box = Rectangle.from_width_height(left, top, random.randint(0, 40), random.randint(0, 12))
+        tokens.append(PdfToken(1, "tag", "token", font, token_index, bounding_box, TokenType.TEXT))
+
+    segments = list()
+    for _ in range(segments_count):
+        left, top = random.randint(0, 500), random.randint(0, 760)
+        bounding_box = Rectangle.from_width_height(left, top, random.randint(1, 200), random.randint(1, 80))
+        text_content = random.choice(["1", "12", "text content"])
+        segments.append(PdfSegment(1, bounding_box, text_content, random.choice(list(TokenType))))
+
+    return PdfPage(1, 612, 792, tokens, "pdf"), segments
+
+
+def find_segment_for_token_scanning(token: PdfToken, segments: list[PdfSegment], tokens_by_segments):
+    best_score: float = 0
+    most_probable_segment: PdfSegment | None = None
+    for segment in segments:
+        intersection_percentage = token.bounding_box.get_intersection_percentage(segment.bounding_box)
+        if intersection_percentage > best_score:
+            best_score = intersection_percentage
+            most_probable_segment = segment
+            if best_score >= 99:
+                break
+    if most_probable_segment:
+        tokens_by_segments.setdefault(most_probable_segment, list()).append(token)
+
+
+def filter_and_sort_segments_scanning(page: PdfPage, tokens_by_segments, types):
+    filtered_segments = [seg for seg in tokens_by_segments.keys() if seg.segment_type in types]
+    order = {
+        seg: sum(page.tokens.index(t) for t in tokens_by_segments[seg]) / len(tokens_by_segments[seg])
+        for seg in filtered_segments
+    }
+    return sorted(filtered_segments, key=lambda seg: order[seg])
+
+
+def get_ordered_segments_for_page_scanning(segments_for_page: list[PdfSegment], page: PdfPage):
+    tokens_by_segments: dict[PdfSegment, list[PdfToken]] = {}
+    for token in page.tokens:
+        find_segment_for_token_scanning(token, segments_for_page, tokens_by_segments)
+
+    page_number_segment: None | PdfSegment = None
+    if tokens_by_segments:
+        last_segment = max(tokens_by_segments.keys(), key=lambda seg: seg.bounding_box.top)
+        if last_segment.text_content and len(last_segment.text_content) < 5:
+            page_number_segment = last_segment
+            del tokens_by_segments[last_segment]
+
+    header_segments = filter_and_sort_segments_scanning(page, tokens_by_segments, {TokenType.PAGE_HEADER})
+    paragraph_types = {t for t in TokenType if t.name not in {"PAGE_HEADER", "PAGE_FOOTER", "FOOTNOTE"}}
+    paragraph_segments = filter_and_sort_segments_scanning(page, tokens_by_segments, paragraph_types)
+    footer_types = {TokenType.PAGE_FOOTER, TokenType.FOOTNOTE}
+    footer_segments = filter_and_sort_segments_scanning(page, tokens_by_segments, footer_types)
+    if page_number_segment:
+        footer_segments.append(page_number_segment)
+    ordered_segments = header_segments + paragraph_segments + footer_segments
+    no_token_segments = [segment for segment in segments_for_page if segment not in ordered_segments]
+    add_no_token_segments_scanning(ordered_segments, no_token_segments)
+    return ordered_segments
+
+
+def add_no_token_segments_scanning(segments, no_token_segments):
+    if segments:
+        for no_token_segment in no_token_segments:
+            closest_segment = sorted(segments, key=lambda seg: get_distance(no_token_segment, seg))[0]
+            closest_index = segments.index(closest_segment)
+            if closest_segment.bounding_box.top < no_token_segment.bounding_box.top:
+                segments.insert(closest_index + 1, no_token_segment)
+            else:
+                segments.insert(closest_index, no_token_segment)
+    else:
+        for segment in sorted(no_token_segments, key=lambda r: (r.bounding_box.left, r.bounding_box.top)):
+            segments.append(segment)
+
+
+def get_distance(segment1: PdfSegment, segment2: PdfSegment):
+    center_1_x = (segment1.bounding_box.left + segment1.bounding_box.right) / 2
+    center_1_y = (segment1.bounding_box.top + segment1.bounding_box.bottom) / 2
+    center_2_x = (segment2.bounding_box.left + segment2.bounding_box.right) / 2
+    center_2_y = (segment2.bounding_box.top + segment2.bounding_box.bottom) / 2
+    return ((center_1_x - center_2_x) ** 2 + (center_1_y - center_2_y) ** 2) ** 0.5
+
+
+class TestGetReadingOrders(TestCase):
+    def test_same_order_as_scanning(self):
+        random.seed(0)
+        for tokens_count, segments_count in [(0, 0), (0, 5), (30, 0), (1, 1), (50, 10), (300, 40), (600, 80)]:
+            page, segments = get_random_page(tokens_count, segments_count)
+            expected = get_ordered_segments_for_page_scanning(segments, page)
+            self.assertEqual([id(s) for s in expected], [id(s) for s in get_ordered_segments_for_page(segments, page)])
+
+    def test_add_no_token_segments(self):
+        random.seed(1)
+        for segments_count, no_token_segments_count in [(0, 4), (1, 3), (20, 20)]:
+            _, segments = get_random_page(0, segments_count + no_token_segments_count)
+            expected = segments[:segments_count]
+            add_no_token_segments_scanning(expected, segments[segments_count:])
+            ordered_segments = segments[:segments_count]
+            add_no_token_segments(ordered_segments, segments[segments_count:])
+            self.assertEqual([id(s) for s in expected], [id(s) for s in ordered_segments])
@@ -0,0 +1,87 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from data_model.Prediction import Prediction
+from pdf_features.Rectangle import Rectangle
+from vgt.predictions_postprocessing import (
+    get_best_predictions_indexes,
+    get_boxes,
+    get_merged_prediction_type,
+    merge_colliding_predictions,
+)
+
+
+def get_random_predictions(predictions_count: int) -> list[Prediction]:
+    predictions = list()
+    for _ in range(predictions_count):
+        left, top = random.randint(0, 550), random.randint(0, 800)
+        bounding_box = Rectangle.from_width_height(left, top, random.randint(1, 60), random.randint(1, 40))
+        score = random.choice([10.0, 20.0, 45.5, 80.0, 99.0, 99.5, random.uniform(0, 100)])
+        predictions.append(Prediction(bounding_box, random.randint(1, 11), score))
+
+    return predictions
+
+
+def merge_colliding_predictions_scanning(predictions: list[Prediction]):
+    predictions = [p for p in predictions if not p.score < 20]
+    while True:
+        new_predictions, merged = [], False
+        while predictions:
+            p1 = predictions.pop(0)
+            to_merge = [p for p in predictions if p1.bounding_box.get_intersection_percentage(p.bounding_box) > 0]
+            for prediction in to_merge:
+                predictions.remove(prediction)
+            if to_merge:
+                to_merge.append(p1)
+                p1.bounding_box = Rectangle.merge_rectangles([prediction.bounding_box for prediction in to_merge])
+                p1.category_id = get_merged_prediction_type(to_merge)
+                merged = True
+            new_predictions.append(p1)
+        if not merged:
+            return new_predictions
+        predictions = new_predictions
+
+
+def find_best_prediction_index_scanning(token_box: Rectangle, predictions: list[Prediction]) -> int:
+    best_score, best_index = 0, -1
+    for index, prediction in enumerate(predictions):
+        if prediction.score > best_score and prediction.bounding_box.get_intersection_percentage(token_box):
+            best_score, best_index = prediction.score, index
+            if best_score >= 99:
+                break
+
+    return best_index
+
+
+def to_tuples(predictions: list[Prediction]):
+    return [(p.bounding_box.to_dict(), p.category_id, p.score) for p in predictions]
+
+
+class TestPredictionsPostprocessing(TestCase):
+    def test_merge_colliding_predictions(self):
+        random.seed(0)
+        for predictions_count in [0, 1, 2, 10, 40, 120]:
+            predictions = get_random_predictions(predictions_count)
+            copies = [Prediction(Rectangle.merge_rectangles([p.bounding_box]), p.category_id, p.score) for p in predictions]
+
+            expected = to_tuples(merge_colliding_predictions_scanning(copies))
+
+            self.assertEqual(expected, to_tuples(merge_colliding_predictions(predictions)))
+
+    def test_best_prediction_for_tokens(self):
+        random.seed(1)
+        for predictions_count in [0, 1, 5, 30]:
+            predictions = get_random_predictions(predictions_count)
+            tokens_boxes = [Rectangle.from_width_height(random.randint(0, 580), random.randint(0, 820), 12, 8)]
+            tokens_boxes += [random.choice(predictions).bounding_box for _ in range(50) if predictions]
+
+            best_indexes = get_best_predictions_indexes(
+                get_boxes(tokens_boxes),
+                get_boxes([prediction.bounding_box for prediction in predictions]),
+                np.array([prediction.score for prediction in predictions]),
+            )
+
+            expected = [find_best_prediction_index_scanning(token_box, predictions) for token_box in tokens_boxes]
+            self.assertEqual(expected, best_indexes.tolist())
@@ -0,0 +1,67 @@
+from importlib.util import find_spec
+from unittest import TestCase, skipUnless
+
+import numpy as np
+
+MODEL_DEPENDENCIES_INSTALLED = find_spec("torch") is not None and find_spec("detectron2") is not None
+
+if MODEL_DEPENDENCIES_INSTALLED:
+    from detectron2.data import detection_utils as utils
+    from detectron2.data import transforms as T
+    from detectron2.structures import BoxMode
+    from ditod.dataset_mapper import transform_subwords_boxes
+
+PAGE_HEIGHT = 1100
+PAGE_WIDTH = 850
+
+
+def transform_subwords_boxes_one_by_one(bbox_subword_list, transforms, image_shape):
+    bbox = []
+    for bbox_per_subword in np.asarray(bbox_subword_list, dtype=np.float64).reshape(-1, 4):
+        text_word = {"bbox": bbox_per_subword.tolist(), "bbox_mode": BoxMode.XYWH_ABS}
+        utils.transform_instance_annotations(text_word, transforms, image_shape)
+        bbox.append(text_word["bbox"])
+
+    return np.array(bbox, dtype=np.float64).reshape(-1, 4)
+
+
+def get_bbox_subword_list(boxes_count: int) -> np.ndarray:
+    rng = np.random.default_rng(boxes_count)
+    lefts, tops = rng.uniform(0, PAGE_WIDTH - 40, boxes_count), rng.uniform(0, PAGE_HEIGHT - 12, boxes_count)
+    widths, heights = rng.uniform(0, 40, boxes_count), rng.uniform(6, 12, boxes_count)
+    outside_boxes = [
+        [-20.5, 10.25, 60.0, 12.0],
+        [830.75, 1090.5, 45.0, 30.0],
+        [-5.0, -8.0, 2.0, 3.0],
+        [900.0, 50.0, 10.0, 9.0],
+    ]
+    return np.concatenate([np.column_stack([lefts, tops, widths, heights]), outside_boxes])
+
+
+@skipUnless(MODEL_DEPENDENCIES_INSTALLED, "torch and detectron2 are not installed")
+class TestTransformSubwordsBoxes(TestCase):
+    def test_same_boxes_as_transform_instance_annotations(self):
+        bbox_subword_list = get_bbox_subword_list(500)
+        for new_height, new_width in [(1100, 850), (800, 618), (1333, 1030)]:
+            image_shape = (new_height, new_width)
+            resize = T.ResizeTransform(PAGE_HEIGHT, PAGE_WIDTH, new_height, new_width)
+            for transforms in [[resize], T.TransformList([resize])]:
+                expected = transform_subwords_boxes_one_by_one(bbox_subword_list, transforms, image_shape)
+                boxes = transform_subwords_boxes(bbox_subword_list, transforms, image_shape)
+                self.assertEqual(expected.shape, boxes.shape)
+                self.assertTrue(np.array_equal(expected, boxes))
+
+    def test_clipped_boxes(self):
+        resize = T.ResizeTransform(PAGE_HEIGHT, PAGE_WIDTH, 800, 618)
+        boxes = transform_subwords_boxes(get_bbox_subword_list(0), [resize], (800, 618))
+        self.assertTrue((boxes >= 0).all())
+        self.assertTrue((boxes[:, [0, 2]] <= 618).all())
+        self.assertTrue((boxes[:, [1, 3]] <= 800).all())
+        self.assertEqual([0, 0, 0, 0], boxes[2].tolist())
+
+    def test_empty_word_grid(self):
+        resize = T.ResizeTransform(PAGE_HEIGHT, PAGE_WIDTH, 800, 618)
+        for bbox_subword_list in [[], np.array([]), np.zeros((0, 4))]:
+            boxes = transform_subwords_boxes(bbox_subword_list, [resize], (800, 618))
+            self.assertEqual((0, 4), boxes.shape)
+            self.assertEqual((0, 4), transform_subwords_boxes_one_by_one(bbox_subword_list, [resize], (800, 618)).shape)
@@ -0,0 +1,38 @@
+import tempfile
+from os.path import join
+from unittest import TestCase
+
+import numpy as np
+
+from vgt.WordGridsFile import WordGridsFile
+
+
+class TestWordGridsFile(TestCase):
+    def test_write_and_read_pages(self):
+        rng = np.random.default_rng(0)
+        grid_words_dicts = list()
+        for subwords_count in [3, 0, 1, 50]:
+            input_ids = rng.integers(0, 30000, subwords_count)
+            grid_words_dicts.append({"input_ids": input_ids, "bbox_subword_list": rng.random((subwords_count, 4)) * 600})
+        grid_words_dicts[1] = {"input_ids": np.array([]), "bbox_subword_list": np.array([])}
+
+        with tempfile.TemporaryDirectory() as word_grids_path:
+            word_grid_path = join(word_grids_path, "pdf.word_grids")
+            WordGridsFile.write(word_grid_path, grid_words_dicts)
+            word_grids_file = WordGridsFile(word_grid_path)
+
+            self.assertEqual(len(grid_words_dicts), len(word_grids_file))
+            for page_index, grid_words_dict in enumerate(grid_words_dicts):
+                page = word_grids_file.get_page(page_index)
+                self.assertEqual(grid_words_dict["input_ids"].tolist(), page["input_ids"].tolist())
+                self.assertEqual(len(grid_words_dict["input_ids"]), len(page["bbox_subword_list"]))
+                expected_boxes = grid_words_dict["bbox_subword_list"].reshape(-1, 4)
+                self.assertTrue(np.array_equal(expected_boxes, page["bbox_subword_list"]))
+
+    def test_not_a_word_grids_file(self):
+        with tempfile.TemporaryDirectory() as word_grids_path:
+            with open(join(word_grids_path, "pdf.word_grids"), "wb") as file:
+                file.write(b"not a word grids file")
+
+            with self.assertRaises(ValueError):
+                WordGridsFile(join(word_grids_path, "pdf.word_grids"))
@@ -0,0 +1,98 @@
+from importlib.util import find_spec
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+import numpy as np
+
+MODEL_DEPENDENCIES_INSTALLED = find_spec("torch") is not None and find_spec("detectron2") is not None
+
+if MODEL_DEPENDENCIES_INSTALLED:
+    import torch
+    from ditod.Wordnn_embedding import WordnnEmbedding, paint_boxes
+
+
+def paint_boxes_one_by_one(chargrid_map, batch_indexes: np.ndarray, boxes: np.ndarray, ids: np.ndarray):
+    for batch_index, (w_start, h_start, w_end, h_end), box_id in zip(batch_indexes.tolist(), boxes.tolist(), ids.tolist()):
+        chargrid_map[batch_index, h_start:h_end, w_start:w_end] = box_id
+
+
+def get_chargrid_map_one_by_one(batched_inputs: list[dict], batch_shape: tuple, stride: int, use_UNK_text: bool):
+    batch_b, batch_h, batch_w = batch_shape
+    chargrid_map = torch.zeros((batch_b, batch_h // stride, batch_w // stride), dtype=torch.int64)
+    for iter_b in range(batch_b):
+        per_input_ids = batched_inputs[iter_b]["input_ids"]
+        per_input_bbox = batched_inputs[iter_b]["bbox"]
+        for word_idx in range(min(len(per_input_ids), len(per_input_bbox))):
+            bbox = per_input_bbox[word_idx] / stride
+            w_start, h_start, w_end, h_end = bbox.round().astype(int).tolist()
+            chargrid_map[iter_b, h_start:h_end, w_start:w_end] = 100 if use_UNK_text else per_input_ids[word_idx]
+
+    return chargrid_map
+
+
+def get_random_boxes(rng: np.random.Generator, boxes_count: int, height: int, width: int) -> np.ndarray:
+    w_bounds = rng.integers(-width // 2, width + width // 2, size=(boxes_count, 2))
+    h_bounds = rng.integers(-height // 2, height + height // 2, size=(boxes_count, 2))
+    return np.column_stack([w_bounds[:, 0], h_bounds[:, 0], w_bounds[:, 1], h_bounds[:, 1]])
+
+
+@skipUnless(MODEL_DEPENDENCIES_INSTALLED, "torch and detectron2 are not installed")
+class TestWordnnEmbedding(TestCase):
+    def assert_same_painting(self, batch_indexes: np.ndarray, boxes: np.ndarray, ids: np.ndarray, shape: tuple):
+        expected = torch.zeros(shape, dtype=torch.int64)
+        paint_boxes_one_by_one(expected, batch_indexes, boxes, ids)
+        chargrid_map = torch.zeros(shape, dtype=torch.int64)
+        paint_boxes(chargrid_map, batch_indexes, boxes, torch.as_tensor(ids))
+        self.assertTrue(torch.equal(expected, chargrid_map))
+
+    def test_paint_boxes_like_one_by_one(self):
+        boxes = np.array(
+            [
+                [2, 2, 10, 8],
+                [5, 4, 12, 6],
+                [-3, -2, 4, 3],
+                [8, 5, 100, 100],
+                [-100, 1, 3, 2],
+                [6, 6, 6, 9],
+                [9, 3, 4, 7],
+                [-5, -5, -1, -2],
+                [-40, -40, -30, -30],
+                [50, 50, 60, 60],
+                [0, 0, 16, 10],
+                [1, 1, 2, 2],
+            ]
+        )
+        ids = np.arange(1, len(boxes) + 1) * 7
+        for batch_size in [1, 3]:
+            batch_indexes = np.arange(len(boxes)) % batch_size
+            self.assert_same_painting(batch_indexes, boxes, ids, (batch_size, 10, 16))
+
+    def test_paint_random_boxes_in_chunks(self):
+        rng = np.random.default_rng(0)
+        boxes = get_random_boxes(rng, 300, 30, 40)
+        batch_indexes = np.sort(rng.integers(0, 3, len(boxes)))
+        ids = rng.integers(1, 30000, len(boxes))
+        for max_painted_pixels in [1, 50, 1 << 20]:
+            with patch("ditod.Wordnn_embedding.MAX_PAINTED_PIXELS", max_painted_pixels):
+                self.assert_same_painting(batch_indexes, boxes, ids, (3, 30, 40))
+
+    def test_paint_no_pixels(self):
+        boxes = np.array([[3, 3, 3, 8], [5, 2, 1, 6], [40, 0, 50, 5]])
+        self.assert_same_painting(np.zeros(len(boxes), dtype=int), boxes, np.array([4, 5, 6]), (1, 10, 16))
+
+    def test_forward_like_one_by_one(self):
+        rng = np.random.default_rng(1)
+        batch_shape = (3, 48, 64)
+        for stride, use_UNK_text in [(1, False), (4, False), (4, True)]:
+            batched_inputs = list()
+            for boxes_count in [20, 0, 35]:
+                bbox = get_random_boxes(rng, boxes_count, 48, 64).astype(np.float64) + rng.uniform(0, 1, (boxes_count, 4))
+                input_ids = rng.integers(1, 500, boxes_count + 2).tolist()
+                batched_inputs.append({"input_ids": input_ids, "bbox": bbox})
+
+            embedding = WordnnEmbedding(500, 16, 8, use_pretrain_weight=False, use_UNK_text=use_UNK_text)
+            img = torch.zeros((batch_shape[0], 3) + batch_shape[1:])
+            expected_map = get_chargrid_map_one_by_one(batched_inputs, batch_shape, stride, use_UNK_text)
+            with torch.no_grad():
+                expected = embedding.embedding_proj(embedding.embedding(expected_map)).permute(0, 3, 1, 2)
+                self.assertTrue(torch.equal(expected, embedding(img, batched_inputs, stride=stride)))